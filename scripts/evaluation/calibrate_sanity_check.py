@@ -0,0 +1,171 @@
+"""
+Script for Calibrating the Score Gate of the Sanity Check from Langfuse Traces
+
+This script fetches recent traces from Langfuse, collects the relevance verdicts
+the LLM gave to retrieved documents in the sanity check step together with their
+similarity to the current query, and reports for each candidate threshold how many LLM calls the
+score gate would save and how often it would agree with the LLM.
+
+Only verdicts coming from the LLM (or its cache) are used as labels. Documents
+decided by the gate itself carry no label, so collect traces with the gate
+disabled (SANITY_CHECK_ACCEPT_SCORE=1.01, SANITY_CHECK_REJECT_SCORE=-1, the
+defaults) for an unbiased report. Documents retrieved only through earlier
+messages have no current-query score and are never gated, so they are skipped.
+
+Environment variables required:
+- LANGFUSE_PUBLIC_KEY
+- LANGFUSE_SECRET_KEY
+- LANGFUSE_HOST
+
+Usage:
+    python calibrate_sanity_check.py --days 7 --target-agreement 0.95
+"""
+
+from dotenv import find_dotenv, load_dotenv
+from datetime import datetime, timedelta
+from os import getenv
+import argparse
+
+from langfuse import Langfuse
+
+
+# Load environment variables from .env file
+load_dotenv(find_dotenv())
+
+# Candidate thresholds reported in the table
+THRESHOLDS = [round(0.05 * step, 2) for step in range(4, 20)]
+
+# Verdict sources that reflect the LLM judgement
+LABELED_SOURCES = ("llm", "cache")
+
+
+def fetch_traces(langfuse, from_timestamp, batch_size=50, max_pages=100):
+    """
+    Fetches all traces from Langfuse starting from a given timestamp.
+    """
+    traces = []
+    for page in range(1, max_pages + 1):
+        traces_batch = langfuse.fetch_traces(
+            limit=batch_size,
+            page=page,
+            from_timestamp=from_timestamp,
+        ).data
+        traces.extend(traces_batch)
+        if len(traces_batch) < batch_size:
+            break
+    return traces
+
+
+def collect_verdicts(langfuse, trace):
+    """
+    Extracts (score, relevant) pairs judged by the LLM from a trace.
+    """
+    labeled_verdicts = []
+    for observation_id in trace.observations:
+        if 'sanity_check' in observation_id:
+            observation = langfuse.fetch_observation(observation_id).data
+            verdicts = (observation.output or {}).get('verdicts') or []
+            labeled_verdicts.extend(
+                (verdict['score'], verdict['relevant'])
+                for verdict in verdicts
+                if verdict.get('source') in LABELED_SOURCES and verdict.get('score') is not None
+            )
+    return labeled_verdicts
+
+
+def build_report(verdicts, thresholds=THRESHOLDS):
+    """
+    Computes gate coverage and agreement with the LLM for each threshold.
+
+    Accepting at a threshold means every document scored at or above it is
+    relevant; rejecting means every document scored below it is irrelevant.
+    """
+    total = len(verdicts)
+    report = []
+    for threshold in thresholds:
+        above = [relevant for score, relevant in verdicts if score >= threshold]
+        below = [relevant for score, relevant in verdicts if score < threshold]
+        report.append({
+            'threshold': threshold,
+            'accept_share': len(above) / total,
+            'accept_agreement': sum(above) / len(above) if above else None,
+            'reject_share': len(below) / total,
+            'reject_agreement': (len(below) - sum(below)) / len(below) if below else None,
+        })
+    return report
+
+
+def recommend_thresholds(report, target_agreement, min_share=0.01):
+    """
+    Picks the lowest accept and the highest reject threshold that agree with
+    the LLM at least as often as the target.
+    """
+    accept_score = next(
+        (row['threshold'] for row in report
+         if row['accept_agreement'] is not None
+         and row['accept_share'] >= min_share
+         and row['accept_agreement'] >= target_agreement),
+        None,
+    )
+    reject_score = next(
+        (row['threshold'] for row in reversed(report)
+         if row['reject_agreement'] is not None
+         and row['reject_share'] >= min_share
+         and row['reject_agreement'] >= target_agreement),
+        None,
+    )
+    return accept_score, reject_score
+
+
+def format_share(value):
+    return '   -  ' if value is None else f'{value:6.1%}'
+
+
+def print_report(verdicts, report, target_agreement):
+    """
+    Prints the calibration table and the recommended thresholds.
+    """
+    positives = sum(relevant for _, relevant in verdicts)
+    print(f"Labeled verdicts: {len(verdicts)} ({positives / len(verdicts):.1%} relevant)")
+    print()
+    print("threshold | accepted | agree w/ LLM | rejected | agree w/ LLM")
+    for row in report:
+        print(
+            f"   {row['threshold']:.2f}   |  {format_share(row['accept_share'])} |"
+            f"    {format_share(row['accept_agreement'])}    |  {format_share(row['reject_share'])} |"
+            f"    {format_share(row['reject_agreement'])}"
+        )
+    
+    accept_score, reject_score = recommend_thresholds(report, target_agreement)
+    print()
+    print(f"Recommended at {target_agreement:.0%} agreement:")
+    print(f"SANITY_CHECK_ACCEPT_SCORE={accept_score if accept_score is not None else 1.01}")
+    print(f"SANITY_CHECK_REJECT_SCORE={reject_score if reject_score is not None else -1}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--days', type=int, default=7, help='How many days of traces to use')
+    parser.add_argument('--target-agreement', type=float, default=0.95,
+                        help='Minimal share of gate decisions matching the LLM')
+    args = parser.parse_args()
+
+    # Initialize Langfuse client
+    langfuse = Langfuse(
+        public_key=getenv("LANGFUSE_PUBLIC_KEY"),
+        secret_key=getenv("LANGFUSE_SECRET_KEY"),
+        host=getenv("LANGFUSE_HOST"),
+    )
+
+    from_timestamp = datetime.now() - timedelta(days=args.days)
+    traces = fetch_traces(langfuse, from_timestamp)
+
+    verdicts = []
+    for trace in traces:
+        verdicts.extend(collect_verdicts(langfuse, trace))
+
+    if not verdicts:
+        print(f"No LLM relevance verdicts found in {len(traces)} traces")
+    else:
+        report = build_report(verdicts)
+        print_report(verdicts, report, args.target_agreement)
@@ -0,0 +1,136 @@
+# Standard library imports
+import logging
+
+# External library imports
+import httpx
+import openai
+
+# Internal module imports
+from src.settings import settings
+
+
+# Configure module-level logging
+logger = logging.getLogger(__name__)
+
+# vLLM Prometheus metrics of automatic prefix caching: token counters of
+# the V1 engine and the hit rate gauge of the V0 engine
+PREFIX_CACHE_METRICS = {
+    "vllm:prefix_cache_queries_total": "queries",
+    "vllm:prefix_cache_hits_total": "hits",
+    "vllm:gpu_prefix_cache_hit_rate": "hit_rate",
+}
+
+# Timeout of the metrics read, short so a slow server can't stall /metrics
+PREFIX_CACHE_METRICS_TIMEOUT_SECONDS = 2.0
+
+
+def parse_prefix_cache_metrics(metrics_text: str) -> dict[str, float]:
+    """Extract prefix cache statistics from vLLM Prometheus metrics.
+    
+    Args:
+        metrics_text: Response of the vLLM `/metrics` endpoint
+        
+    Returns:
+        Queried and hit prompt tokens (summed over label sets) and the hit
+        rate, as far as the server reports them
+    """
+    stats: dict[str, float] = {}
+    for line in metrics_text.splitlines():
+        if not line or line.startswith("#"):
+            continue
+        name_with_labels, _, value = line.rpartition(" ")
+        name = name_with_labels.split("{", 1)[0]
+        if name in PREFIX_CACHE_METRICS:
+            key = PREFIX_CACHE_METRICS[name]
+            stats[key] = stats.get(key, 0.0) + float(value)
+    
+    if stats.get("queries"):
+        stats["hit_rate"] = stats.get("hits", 0.0) / stats["queries"]
+    return stats
+
+
+class LLMClientRegistry:
+    """Process-wide registry of pooled clients for OpenAI-compatible LLM APIs.
+    
+    Clients are keyed by base URL and API key and shared by all workflow
+    steps, so requests reuse keep-alive connections to vLLM instead of
+    opening a new pool per request.
+    """
+
+    def __init__(self):
+        """Create an empty registry; clients are opened by `start` or on first use."""
+        self._clients: dict[tuple[str, str], openai.AsyncOpenAI] = {}
+
+    @staticmethod
+    def _create_client(base_url: str, api_key: str) -> openai.AsyncOpenAI:
+        """Create a client with the pool limits and timeouts from `LLMSettings`."""
+        http_client = openai.DefaultAsyncHttpxClient(
+            timeout=settings.llm.TIMEOUT,
+            limits=httpx.Limits(
+                max_connections=settings.llm.MAX_CONNECTIONS,
+                max_keepalive_connections=settings.llm.MAX_KEEPALIVE_CONNECTIONS,
+                keepalive_expiry=settings.llm.KEEPALIVE_EXPIRY,
+            ),
+        )
+        logger.info(f"Opened LLM connection pool to {base_url}")
+        return openai.AsyncOpenAI(
+            base_url=base_url,
+            api_key=api_key,
+            timeout=settings.llm.TIMEOUT,
+            max_retries=settings.llm.MAX_RETRIES,
+            http_client=http_client,
+        )
+
+    def get(self, base_url: str | None = None, api_key: str | None = None) -> openai.AsyncOpenAI:
+        """Return the shared client for an LLM endpoint, creating it if needed.
+        
+        Args:
+            base_url: Base URL of the API (configured LLM by default)
+            api_key: API key (configured LLM key by default)
+            
+        Returns:
+            Pooled async OpenAI client
+        """
+        key = (base_url or settings.llm.API_BASE_URL, api_key or settings.llm.API_KEY)
+        if key not in self._clients:
+            self._clients[key] = self._create_client(*key)
+        return self._clients[key]
+
+    async def fetch_prefix_cache_stats(self) -> dict[str, float] | None:
+        """Read prefix cache statistics of the configured vLLM server.
+        
+        The counters are cumulative since the server started, so layout
+        changes are compared by the deltas between two reads. The read uses
+        a short timeout and no retries, unlike completions.
+        
+        Returns:
+            Statistics from `parse_prefix_cache_metrics`, or None if the
+            metrics endpoint is unavailable
+        """
+        metrics_url = settings.llm.METRICS_URL or (
+            settings.llm.API_BASE_URL.rstrip("/").removesuffix("/v1") + "/metrics"
+        )
+        try:
+            client = self.get().with_options(
+                timeout=PREFIX_CACHE_METRICS_TIMEOUT_SECONDS, max_retries=0
+            )
+            response = await client.get(metrics_url, cast_to=httpx.Response)
+            return parse_prefix_cache_metrics(response.text)
+        except Exception as e:
+            logger.warning(f"Failed to read LLM prefix cache metrics from {metrics_url}: {e}")
+            return None
+
+    def start(self):
+        """Open the client of the configured LLM ahead of the first request."""
+        self.get()
+
+    async def aclose(self):
+        """Close all clients and their connection pools."""
+        for client in self._clients.values():
+            await client.close()
+        self._clients.clear()
+        logger.info("LLM connection pools closed")
+
+
+# Singleton instance for global access
+llm_clients = LLMClientRegistry()
@@ -0,0 +1,205 @@
+# Standard library imports
+import json
+import logging
+from typing import Literal
+
+# Internal module imports
+from src.settings import settings
+
+
+# Configure module-level logging
+logger = logging.getLogger(__name__)
+
+
+SANITY_CHECK_SYSTEM_PROMPT = (
+    "Твоя задача - определить, релевантны ли предоставленные документы запросу пользователя. "
+    "Релевантым считай тот документ, в котором тема хотя бы смежно связана с запросом. "
+    "Верни ровно один массив из строк '0' или '1', где '1' означает, что документ релевантен запросу, "
+    "а '0' - что нерелевантен. Массив должен иметь ровно столько элементов, сколько документов в запросе."
+)
+
+SANITY_CHECK_USER_TEMPLATE = (
+    "Прошлые сообщения пользователя: '{previous_messages}'. "
+    "Запрос пользователя: '{query}'. "
+    "Оцени релевантность каждого документа к этому запросу с учетом контекста "
+    "и верни массив из {documents_count} элементов, где каждый элемент - '0' или '1'."
+)
+
+REPLY_SYSTEM_PROMPT = (
+    "Ты помощник, который дает ответы на основе предоставленных примеров вопросов и ответов. "
+    "Используй предоставленные вопросы и ответы как образец стиля и уровня детализации. "
+    "Обращай внимание на прошлые сообщения для ответа на запрос пользователя. "
+    "Не задавай уточняющих вопросов. "
+    "Если примеры вопросов и ответов не содержат релевантной для запроса информации, "
+    "не придумывай ответ, а дай знать пользователю."
+)
+
+PromptLayout = Literal["system", "documents_role", "no_system"]
+
+
+class PromptTemplate:
+    """Chat prompt of one workflow step for one family of models.
+    
+    Messages are laid out with the content shared between requests first
+    (system prompt, then documents) and the per-request part (history,
+    query) last, so vLLM automatic prefix caching can reuse the KV cache
+    of the common prefix. Layouts:
+    - `system`: system prompt and documents in the system message
+    - `documents_role`: documents as JSON in a separate `documents`
+      message (Vikhr)
+    - `no_system`: system prompt and documents prepended to the first user
+      message, for chat templates without a system role (Gemma 2)
+    """
+
+    def __init__(
+        self,
+        layout: PromptLayout,
+        system_prompt: str,
+        user_template: str,
+        documents_header: str = "",
+        document_template: str = "",
+        json_document_keys: tuple[str, str] = ("question", "answer"),
+    ):
+        """Initialize the template.
+        
+        Args:
+            layout: How the system prompt and documents are placed
+            system_prompt: Instructions of the step
+            user_template: Format string of the final user message; gets
+                `documents_count` and the fields passed to `render`
+            documents_header: Text preceding the documents in text layouts
+            document_template: Format string of one document in text
+                layouts; gets `idx`, `number`, `question` and `answer`
+            json_document_keys: Keys of question and answer in the
+                `documents_role` layout
+        """
+        self.layout = layout
+        self.system_prompt = system_prompt
+        self.user_template = user_template
+        self.document_template = document_template
+        self.json_document_keys = json_document_keys
+        
+        # Static start of the preamble, built once
+        self._preamble_prefix = f"{system_prompt}\n\n{documents_header}"
+
+    def render_documents(self, qa_pairs: list[tuple[str, str]]) -> str:
+        """Render the documents block of the prompt.
+        
+        Args:
+            qa_pairs: Question-answer pairs in prompt order
+        
+        Returns:
+            JSON list for the `documents_role` layout, text otherwise
+        """
+        if self.layout == "documents_role":
+            question_key, answer_key = self.json_document_keys
+            documents = [
+                {"doc_id": idx, question_key: question, answer_key: answer}
+                for idx, (question, answer) in enumerate(qa_pairs)
+            ]
+            return json.dumps(documents, ensure_ascii=False)
+        
+        return "".join(
+            self.document_template.format(
+                idx=idx, number=idx + 1, question=question, answer=answer
+            )
+            for idx, (question, answer) in enumerate(qa_pairs)
+        )
+
+    def render(
+        self, qa_pairs: list[tuple[str, str]], history: list[dict] | None = None, **fields
+    ) -> list[dict]:
+        """Build the chat messages for the LLM.
+        
+        Args:
+            qa_pairs: Question-answer pairs included as documents
+            history: Previous conversation messages (not modified)
+            **fields: Values for the user template
+        
+        Returns:
+            Messages for the chat completions API
+        """
+        user_message = {
+            "role": "user",
+            "content": self.user_template.format(documents_count=len(qa_pairs), **fields),
+        }
+        history = [dict(msg) for msg in history or []]
+        documents = self.render_documents(qa_pairs)
+        
+        if self.layout == "documents_role":
+            return [
+                {"role": "system", "content": self.system_prompt},
+                {"role": "documents", "content": documents},
+                *history,
+                user_message,
+            ]
+        
+        preamble = f"{self._preamble_prefix}{documents}".rstrip()
+        if self.layout == "system":
+            return [{"role": "system", "content": preamble}, *history, user_message]
+        
+        messages = [*history, user_message]
+        messages[0]["content"] = f"{preamble}\n\n{messages[0]['content']}"
+        return messages
+
+
+# Model-specific layouts; other models use the `system` layout
+MODEL_LAYOUTS: dict[str, PromptLayout] = {
+    "Vikhrmodels/Vikhr-Nemo-12B-Instruct-R-21-09-24": "documents_role",
+    "google/gemma-2-9b-it": "no_system",
+}
+
+# Templates of the LLM workflow steps by layout
+PROMPT_TEMPLATES: dict[str, dict[PromptLayout, PromptTemplate]] = {
+    "sanity_check": {
+        "documents_role": PromptTemplate(
+            layout="documents_role",
+            system_prompt=SANITY_CHECK_SYSTEM_PROMPT,
+            user_template=SANITY_CHECK_USER_TEMPLATE,
+            json_document_keys=("title", "content"),
+        ),
+        **{
+            layout: PromptTemplate(
+                layout=layout,
+                system_prompt=SANITY_CHECK_SYSTEM_PROMPT,
+                user_template=SANITY_CHECK_USER_TEMPLATE,
+                documents_header="Документы:\n",
+                document_template="Документ {idx}:\nВопрос: {question}\nОтвет: {answer}\n\n",
+            )
+            for layout in ("system", "no_system")
+        },
+    },
+    "reply": {
+        "documents_role": PromptTemplate(
+            layout="documents_role",
+            system_prompt=REPLY_SYSTEM_PROMPT,
+            user_template="{query}",
+        ),
+        **{
+            layout: PromptTemplate(
+                layout=layout,
+                system_prompt=REPLY_SYSTEM_PROMPT,
+                user_template="Запрос пользователя: {query}",
+                documents_header="Примеры вопросов и ответов:\n",
+                document_template="Пример {number}:\nВопрос: {question}\nОтвет: {answer}\n\n",
+            )
+            for layout in ("system", "no_system")
+        },
+    },
+}
+
+
+def get_prompt_template(
+    step: Literal["sanity_check", "reply"], model_name: str | None = None
+) -> PromptTemplate:
+    """Return the prompt template of a workflow step for the model.
+    
+    Args:
+        step: Workflow step building the prompt
+        model_name: Served model (configured LLM by default)
+    
+    Returns:
+        Prompt template with the model's layout
+    """
+    layout = MODEL_LAYOUTS.get(model_name or settings.llm.MODEL_NAME, "system")
+    return PROMPT_TEMPLATES[step][layout]
@@ -1,21 +1,53 @@
 # Standard library imports
-import csv
+import asyncio
 import logging
-import os
+import time
+from typing import Literal
 
 # External library imports
-import httpx
-from qdrant_client import QdrantClient
-from qdrant_client.http.models import PointStruct, VectorParams
+from qdrant_client import AsyncQdrantClient
+from qdrant_client.http.models import (
+    CreateAlias,
+    CreateAliasOperation,
+    DeleteAlias,
+    DeleteAliasOperation,
+    PayloadSchemaType,
+    PointIdsList,
+    PointStruct,
+    ScalarQuantization,
+    ScoredPoint,
+    ScalarQuantizationConfig,
+    ScalarType,
+    VectorParams,
+)
 
 # Internal module imports
+from src.caching import LRUCache
+from src.metrics import metrics
 from src.settings import settings
+from .embedder import EmbeddingClient
+from .embedding_store import EmbeddingStore
+from .exact_match import ExactMatchIndex
+from .fusion import fusion_key, reciprocal_rank_fusion
+from .ingestion import (
+    ANSWER_GROUP_FIELD,
+    SEARCH_PAYLOAD_FIELDS,
+    build_point,
+    compute_row_hash,
+    load_qa_pairs,
+    row_hash_to_point_id,
+)
+from .search_backends import NumpySearchBackend, QdrantSearchBackend, SearchBackend
 
 
 # Configure module-level logging
 logger = logging.getLogger(__name__)
 
 
+# Lifecycle of the retrieval singleton, reported by the readiness probe
+RetrievalState = Literal["initializing", "ready", "degraded"]
+
+
 class RetrievalManager:
     """Manages vector-based retrieval of question-answer pairs using Qdrant.
     
@@ -27,129 +59,583 @@ class RetrievalManager:
         """Initialize the retrieval manager with Qdrant client and configuration."""
         logger.info("Initializing RetrievalManager")
         
-        self.qdrant_client = QdrantClient(url=settings.qdrant.URL)
-        self.collection_name = settings.qdrant.QA_COLLECTION_NAME
-        self.vector_size = 768  # Standard embedding dimension
+        # One client for the lifetime of the app, so connections are reused
+        self.qdrant_client = AsyncQdrantClient(
+            url=settings.qdrant.URL,
+            prefer_grpc=settings.qdrant.PREFER_GRPC,
+            grpc_port=settings.qdrant.GRPC_PORT,
+            timeout=settings.qdrant.TIMEOUT,
+        )
+        self.embedding_client = EmbeddingClient.from_settings()
+        self.query_embedding_cache = LRUCache(
+            maxsize=settings.embedder.QUERY_CACHE_SIZE,
+            ttl_seconds=settings.embedder.QUERY_CACHE_TTL_SECONDS,
+        )
+        metrics.register_gauge(
+            "retrieval.query_embedding_cache", self.query_embedding_cache.stats
+        )
+        self.collection_name = settings.qdrant.QA_COLLECTION_NAME  # Alias of the served collection
+        self.vector_size = None  # Detected from the collection or the embedder
         self.distance_metric = "Cosine"  # Cosine similarity for text embeddings
         self.top_results_count = settings.qdrant.TOP_N
+        # Return distinct answers instead of near-identical QA pairs
+        self.group_by = ANSWER_GROUP_FIELD if settings.qdrant.GROUP_BY_ANSWER else None
         
-        logger.info(f"Configured for collection '{self.collection_name}' "
-                   f"with vector size {self.vector_size}")
         
-        self.ensure_collection_populated()
+        # Populated by `initialize`, which runs as a background startup task
+        self.state: RetrievalState = "initializing"
+        self.state_detail = None
+        self.search_backend: SearchBackend | None = None
+        self.exact_match_index = ExactMatchIndex()
+        metrics.register_gauge(
+            "retrieval.state", lambda: {"state": self.state, "detail": self.state_detail}
+        )
+        
+        logger.info(f"Configured for collection '{self.collection_name}'")
 
-    def _check_collection_has_data(self) -> bool:
-        """Check if the collection exists and contains data.
+    @property
+    def is_serving(self) -> bool:
+        """Check whether queries can be answered (ready or degraded with an index)."""
+        return self.search_backend is not None
+
+    async def initialize(self):
+        """Sync the knowledge base and load the search index.
         
-        Returns:
-            True if collection exists and has points, False otherwise
+        Meant to run as a background task so the server can accept
+        connections meanwhile. If syncing fails but a previously indexed
+        collection exists, it is served as is and the state is `degraded`.
+        If the index cannot be loaded at all, the state is `degraded` and the
+        whole initialization is retried after `QdrantSettings.INIT_RETRY_SECONDS`.
         """
+        while True:
+            try:
+                await self._initialize_once()
+                break
+            except Exception as e:
+                self.state = "degraded"
+                self.state_detail = f"Search index unavailable: {e}"
+                logger.exception(f"Retrieval initialization failed, retrying in "
+                                 f"{settings.qdrant.INIT_RETRY_SECONDS:.0f}s: {e}")
+                await asyncio.sleep(settings.qdrant.INIT_RETRY_SECONDS)
+        
+        if settings.qdrant.QUANTIZATION_REPORT_SAMPLES > 0 and self._is_quantized():
+            try:
+                await self._report_quantization_quality()
+            except Exception as e:
+                logger.warning(f"Quantization quality report failed: {e}")
+
+    async def _initialize_once(self):
+        """Run one initialization attempt and update the state."""
+        sync_error = None
         try:
-            collection_info = self.qdrant_client.get_collection(self.collection_name)
-            has_data = collection_info.points_count > 0
-            logger.info(f"Collection '{self.collection_name}' has {collection_info.points_count} points")
-            return has_data
+            await self.ensure_collection_populated()
         except Exception as e:
-            logger.warning(f"Collection check failed: {e}")
-            return False
+            if await self._get_alias_target() is None:
+                raise
+            sync_error = e
+            logger.exception(f"Knowledge base sync failed, serving the existing collection: {e}")
+        
+        search_backend = await self._create_search_backend()
+        self.exact_match_index = await self._create_exact_match_index(search_backend)
+        self.search_backend = search_backend
+        
+        if sync_error is None:
+            self.state = "ready"
+            self.state_detail = None
+        else:
+            self.state = "degraded"
+            self.state_detail = f"Knowledge base sync failed, serving stale index: {sync_error}"
+        logger.info(f"RetrievalManager is {self.state}")
+
+    def _is_quantized(self) -> bool:
+        """Check whether searches run on quantized vectors."""
+        if settings.qdrant.SEARCH_BACKEND == "numpy":
+            return settings.qdrant.INDEX_PRECISION != "float32"
+        return settings.qdrant.QUANTIZATION != "none"
+
+    async def _report_quantization_quality(self):
+        """Log recall and latency of quantized search against full precision."""
+        report = await self.search_backend.compare_with_exact(
+            limit=self.top_results_count,
+            sample_size=settings.qdrant.QUANTIZATION_REPORT_SAMPLES,
+        )
+        metrics.register_gauge("retrieval.quantization_report", lambda: report)
+        logger.info(f"Quantized search recall@{self.top_results_count}: {report['recall']:.3f} "
+                    f"over {report['queries']} queries, mean latency "
+                    f"{report['search_ms']:.2f} ms vs {report['exact_ms']:.2f} ms full precision")
+
+    async def _create_search_backend(self) -> SearchBackend:
+        """Create the search backend selected in `QdrantSettings`.
+        
+        Returns:
+            In-process NumPy backend loaded from the collection, or the
+            Qdrant backend
+        """
+        if settings.qdrant.SEARCH_BACKEND == "numpy":
+            search_backend = NumpySearchBackend(
+                precision=settings.qdrant.INDEX_PRECISION,
+                rescore_oversampling=settings.qdrant.RESCORE_OVERSAMPLING,
+                rescore_dir=settings.embedder.CACHE_DIR or None,
+            )
+            await search_backend.load(
+                self.qdrant_client,
+                self.collection_name,
+                payload_fields=SEARCH_PAYLOAD_FIELDS,
+                vector_size=self.vector_size,
+            )
+        else:
+            search_backend = QdrantSearchBackend(
+                self.qdrant_client,
+                self.collection_name,
+                rescore_oversampling=(
+                    settings.qdrant.RESCORE_OVERSAMPLING if self._is_quantized() else None
+                ),
+                payload_fields=SEARCH_PAYLOAD_FIELDS,
+                group_oversampling=settings.qdrant.GROUP_OVERSAMPLING,
+            )
+        
+        logger.info(f"Using '{settings.qdrant.SEARCH_BACKEND}' search backend")
+        return search_backend
+
+    async def _scroll_payloads(self, page_size: int = 1024) -> list[dict]:
+        """Fetch the search payload fields of all points in the collection.
+        
+        Args:
+            page_size: Number of points fetched per scroll request
+            
+        Returns:
+            List of point payloads
+        """
+        payloads = []
+        next_offset = None
+        while True:
+            points, next_offset = await self.qdrant_client.scroll(
+                collection_name=self.collection_name,
+                limit=page_size,
+                offset=next_offset,
+                with_payload=SEARCH_PAYLOAD_FIELDS,
+                with_vectors=False,
+            )
+            payloads.extend(point.payload for point in points)
+            if next_offset is None:
+                return payloads
+
+    async def _create_exact_match_index(self, search_backend: SearchBackend) -> ExactMatchIndex:
+        """Build the exact-match index over the loaded collection.
+        
+        Args:
+            search_backend: Freshly loaded search backend
+            
+        Returns:
+            Index of normalized questions to stored answers
+        """
+        exact_match_index = ExactMatchIndex()
+        if settings.workflow.EXACT_MATCH_POLICY == "off":
+            return exact_match_index
+        
+        if isinstance(search_backend, NumpySearchBackend):
+            payloads = search_backend.payloads
+        else:
+            payloads = await self._scroll_payloads()
+        
+        # Normalizing every question is CPU-bound, keep it off the event loop
+        await asyncio.to_thread(exact_match_index.build, payloads)
+        return exact_match_index
+
+    async def _get_alias_target(self) -> str | None:
+        """Return the versioned collection the serving alias points to.
+        
+        Returns:
+            Collection name, or None if the alias does not exist
+        """
+        for alias in (await self.qdrant_client.get_aliases()).aliases:
+            if alias.alias_name == self.collection_name:
+                return alias.collection_name
+        return None
+
+    async def _needs_full_rebuild(self, target_collection: str | None) -> bool:
+        """Decide whether the knowledge base must be re-indexed from scratch.
+        
+        Args:
+            target_collection: Collection currently served through the alias
+            
+        Returns:
+            True if a new versioned collection has to be built
+        """
+        if settings.qdrant.FORCE_REBUILD:
+            logger.info("Full rebuild forced by configuration")
+            return True
+        
+        if target_collection is None:
+            logger.info(f"No versioned collection behind alias '{self.collection_name}'")
+            return True
+        
+        points, _ = await self.qdrant_client.scroll(
+            collection_name=target_collection,
+            limit=1,
+            with_payload=["embedder_model"],
+            with_vectors=False,
+        )
+        indexed_model = points[0].payload.get("embedder_model") if points else None
+        if points and indexed_model != settings.embedder.MODEL_NAME:
+            logger.info(f"Collection '{target_collection}' was embedded with '{indexed_model}', "
+                        f"configured embedder is '{settings.embedder.MODEL_NAME}'")
+            return True
+        
+        return False
 
-    def _create_collection(self):
-        """Create a new Qdrant collection with appropriate vector configuration."""
-        logger.info(f"Creating new collection '{self.collection_name}'")
+    async def _create_collection(self, collection_name: str):
+        """Create a new Qdrant collection with appropriate vector configuration.
+        
+        Args:
+            collection_name: Name of the collection to create
+        """
+        logger.info(f"Creating new collection '{collection_name}' "
+                    f"with vector size {self.vector_size}")
         
-        self.qdrant_client.create_collection(
-            self.collection_name,
+        quantization_config = None
+        if settings.qdrant.QUANTIZATION == "int8":
+            quantization_config = ScalarQuantization(
+                scalar=ScalarQuantizationConfig(
+                    type=ScalarType.INT8,
+                    quantile=settings.qdrant.QUANTIZATION_QUANTILE,
+                    always_ram=settings.qdrant.QUANTIZATION_ALWAYS_RAM,
+                )
+            )
+        
+        await self.qdrant_client.create_collection(
+            collection_name,
             vectors_config=VectorParams(
                 size=self.vector_size,
                 distance=self.distance_metric,
+                on_disk=settings.qdrant.VECTORS_ON_DISK,
             ),
+            quantization_config=quantization_config,
         )
+        await self._create_payload_indexes(collection_name)
         
         logger.info("Collection created successfully")
 
-    def _generate_text_embedding(self, text: str) -> list[float]:
-        """Generate embedding for the given text using the configured embedder.
+    async def _create_payload_indexes(self, collection_name: str):
+        """Index the payload fields used for grouping search results.
+        
+        Args:
+            collection_name: Collection to index
+        """
+        await self.qdrant_client.create_payload_index(
+            collection_name=collection_name,
+            field_name=ANSWER_GROUP_FIELD,
+            field_schema=PayloadSchemaType.KEYWORD,
+        )
+
+    async def _swap_alias(self, new_collection: str, old_collection: str | None):
+        """Atomically point the serving alias to a new collection.
         
         Args:
-            text: Input text to embed
+            new_collection: Fully populated collection to serve
+            old_collection: Collection served so far, deleted after the swap
+        """
+        # Collections created before versioning occupy the alias name
+        existing_collections = {
+            collection.name for collection in (await self.qdrant_client.get_collections()).collections
+        }
+        if self.collection_name in existing_collections:
+            logger.warning(f"Replacing unversioned collection '{self.collection_name}' "
+                           f"with alias; it is unavailable until the alias is created")
+            await self.qdrant_client.delete_collection(self.collection_name)
+        
+        alias_operations = []
+        if old_collection is not None:
+            alias_operations.append(DeleteAliasOperation(
+                delete_alias=DeleteAlias(alias_name=self.collection_name)
+            ))
+        alias_operations.append(CreateAliasOperation(
+            create_alias=CreateAlias(
+                collection_name=new_collection, alias_name=self.collection_name
+            )
+        ))
+        await self.qdrant_client.update_collection_aliases(change_aliases_operations=alias_operations)
+        logger.info(f"Alias '{self.collection_name}' now points to '{new_collection}'")
+        
+        if old_collection is not None:
+            await self.qdrant_client.delete_collection(old_collection)
+            logger.info(f"Deleted previous collection '{old_collection}'")
+
+    @staticmethod
+    async def _detect_vector_size(embedding_client: EmbeddingClient) -> int:
+        """Ask the embedder for the dimensionality of its vectors.
+        
+        Args:
+            embedding_client: Client of the configured embedder
             
         Returns:
-            List of float values representing the text embedding
-            
-        Raises:
-            Exception: If the embedding API call fails
+            Embedding dimension
         """
-        embedder_endpoint = f"{settings.embedder.API_BASE_URL}/embeddings"
-        headers = {"Content-Type": "application/json"}
-        payload = {"model": settings.embedder.MODEL_NAME, "input": [text]}
+        vector_size = len(await embedding_client.embed_text("размерность эмбеддинга"))
+        logger.info(f"Embedder '{embedding_client.model_name}' produces {vector_size}-dimensional vectors")
+        return vector_size
+
+    async def _rebuild_collection(
+        self,
+        hashed_rows: dict[str, tuple[dict[str, str], str]],
+        old_collection: str | None,
+        embedding_client: EmbeddingClient,
+    ):
+        """Index all rows into a new versioned collection and swap it in.
         
-        logger.debug(f"Generating embedding for text: {text[:50]}...")
+        The alias keeps serving the old collection until the new one is
+        complete.
         
-        with httpx.Client() as client:
-            print(embedder_endpoint)
-            logger.warning(embedder_endpoint)
-            response = client.post(embedder_endpoint, headers=headers, json=payload)
-            response_data = response.json()
-            
-            if response.status_code == 200:
-                embedding = response_data.get("data", [])[0].get("embedding", [])
-                logger.debug(f"Generated embedding with {len(embedding)} dimensions")
-                return embedding
-            else:
-                error_msg = f"Embeddings API error: {response.status_code} - {response_data}"
-                logger.error(error_msg)
-                raise Exception(error_msg)
-
-    def ensure_collection_populated(self):
-        """Ensure the collection exists and is populated with data from CSV file."""
-        if not self._check_collection_has_data():
-            logger.info("Collection needs to be populated with data")
-            self._create_collection()
-            self._populate_collection_from_csv()
+        Args:
+            hashed_rows: Rows with their content hashes, keyed by point id
+            old_collection: Collection currently served through the alias
+            embedding_client: Client used to embed the questions
+        """
+        new_collection = f"{self.collection_name}_v{time.time_ns() // 1_000_000}"
+        
+        self.vector_size = await self._detect_vector_size(embedding_client)
+        await self._create_collection(new_collection)
+        try:
+            await self._upsert_rows(new_collection, list(hashed_rows.values()), embedding_client)
+        except Exception:
+            logger.exception(f"Rebuild failed, dropping incomplete collection '{new_collection}'")
+            await self.qdrant_client.delete_collection(new_collection)
+            raise
+        
+        await self._swap_alias(new_collection, old_collection)
+
+    async def _apply_incremental_changes(
+        self,
+        collection_name: str,
+        hashed_rows: dict[str, tuple[dict[str, str], str]],
+        embedding_client: EmbeddingClient,
+    ):
+        """Upsert new or changed rows and delete removed ones in place.
+        
+        Point ids are derived from row content, so a changed row shows up as
+        one new point plus one stale point.
+        
+        Args:
+            collection_name: Collection currently served through the alias
+            hashed_rows: Rows with their content hashes, keyed by point id
+            embedding_client: Client used to embed the questions
+        """
+        collection_info = await self.qdrant_client.get_collection(collection_name)
+        self.vector_size = collection_info.config.params.vectors.size
+        if ANSWER_GROUP_FIELD not in (collection_info.payload_schema or {}):
+            await self._create_payload_indexes(collection_name)
+        
+        indexed_ids = set()
+        next_offset = None
+        while True:
+            points, next_offset = await self.qdrant_client.scroll(
+                collection_name=collection_name,
+                limit=1024,
+                offset=next_offset,
+                with_payload=False,
+                with_vectors=False,
+            )
+            indexed_ids.update(str(point.id) for point in points)
+            if next_offset is None:
+                break
+        
+        new_rows = [
+            hashed_row for point_id, hashed_row in hashed_rows.items()
+            if point_id not in indexed_ids
+        ]
+        stale_ids = [point_id for point_id in indexed_ids if point_id not in hashed_rows]
+        
+        logger.info(f"Collection '{collection_name}' sync: {len(new_rows)} new or changed rows, "
+                    f"{len(stale_ids)} removed, "
+                    f"{len(hashed_rows) - len(new_rows)} unchanged")
+        
+        if new_rows:
+            await self._upsert_rows(collection_name, new_rows, embedding_client)
+        if stale_ids:
+            await self.qdrant_client.delete(
+                collection_name=collection_name,
+                points_selector=PointIdsList(points=stale_ids),
+            )
+
+    async def ensure_collection_populated(self):
+        """Ensure the collection exists and matches the CSV knowledge base.
+        
+        Only new, changed and removed rows are applied to the served
+        collection. A full rebuild (missing collection, changed embedder or
+        forced via settings) goes to a new versioned collection that replaces
+        the old one atomically through the alias.
+        """
+        hashed_rows = {}
+        for row in load_qa_pairs():
+            row_hash = compute_row_hash(row)
+            hashed_rows[row_hash_to_point_id(row_hash)] = (row, row_hash)
+        
+        target_collection = await self._get_alias_target()
+        
+        if await self._needs_full_rebuild(target_collection):
+            await self._rebuild_collection(hashed_rows, target_collection, self.embedding_client)
         else:
-            logger.info("Collection already contains data")
+            await self._apply_incremental_changes(target_collection, hashed_rows, self.embedding_client)
 
-    def _populate_collection_from_csv(self):
-        """Populate the collection with QA pairs from the CSV resource file."""
-        csv_file_path = os.path.join(
-            os.path.dirname(__file__), "resources", "qa_df_pairs_db.csv"
+    async def _upsert_points(self, collection_name: str, points: list[PointStruct]):
+        """Upsert a chunk of points into the collection.
+        
+        Args:
+            collection_name: Target collection
+            points: Points to insert or update
+        """
+        await self.qdrant_client.upsert(
+            collection_name=collection_name,
+            points=points
         )
+
+    def _open_embedding_store(self) -> EmbeddingStore | None:
+        """Open the persistent embedding cache if it is enabled.
+        
+        Returns:
+            Embedding store for the configured model, or None if disabled
+        """
+        if not settings.embedder.CACHE_DIR:
+            return None
+        return EmbeddingStore(settings.embedder.CACHE_DIR, settings.embedder.MODEL_NAME)
+
+    async def _upsert_rows(
+        self,
+        collection_name: str,
+        hashed_rows: list[tuple[dict[str, str], str]],
+        embedding_client: EmbeddingClient,
+    ):
+        """Embed knowledge base rows and upsert them into the collection.
+        
+        Questions found in the persistent embedding store are not sent to the
+        embedder again. The rest are embedded in batches with bounded
+        concurrency, and the resulting points are upserted in chunks while
+        embedding continues. If embedding or an upsert fails, the upserts
+        still in flight are cancelled and awaited before the error is raised.
         
-        logger.info(f"Loading QA pairs from {csv_file_path}")
+        Args:
+            collection_name: Target collection
+            hashed_rows: Rows with their content hashes
+            embedding_client: Client used to embed the questions
+        """
+        questions = [row["question_clear"] for row, _ in hashed_rows]
         
-        points = []
-        with open(csv_file_path, newline='', encoding='utf-8') as csvfile:
-            csv_reader = csv.DictReader(csvfile)
+        upsert_batch_size = settings.qdrant.UPSERT_BATCH_SIZE
+        pending_points = []
+        upsert_tasks = []
+        started_at = time.perf_counter()
+
+        def flush_full_chunks():
+            # Stream full chunks to Qdrant without pausing embedding
+            nonlocal pending_points
+            while len(pending_points) >= upsert_batch_size:
+                chunk = pending_points[:upsert_batch_size]
+                pending_points = pending_points[upsert_batch_size:]
+                upsert_tasks.append(asyncio.create_task(
+                    self._upsert_points(collection_name, chunk)
+                ))
+        
+        # Upserts already started must not outlive a failed ingestion
+        try:
+            # Reuse embeddings computed by earlier populations
+            embedding_store = self._open_embedding_store()
+            if embedding_store is not None:
+                cached_embeddings = embedding_store.get_many(questions)
+            else:
+                cached_embeddings = [None] * len(hashed_rows)
+        
+            missing_indices = []
+            for idx, cached_embedding in enumerate(cached_embeddings):
+                if cached_embedding is None:
+                    missing_indices.append(idx)
+                else:
+                    pending_points.append(build_point(*hashed_rows[idx], cached_embedding))
+            flush_full_chunks()
+        
+            cached_count = len(hashed_rows) - len(missing_indices)
+            logger.info(f"Embedding cache hit rate: {cached_count}/{len(hashed_rows)} "
+                        f"({cached_count / max(len(hashed_rows), 1):.1%}), "
+                        f"embedding {len(missing_indices)} new questions")
+        
+            missing_questions = [questions[idx] for idx in missing_indices]
+            embedded_count = 0
+        
+            async for start, embeddings in embedding_client.embed_texts_in_batches(
+                missing_questions,
+                batch_size=settings.embedder.BATCH_SIZE,
+                concurrency=settings.embedder.INGEST_CONCURRENCY,
+            ):
+                if embedding_store is not None:
+                    embedding_store.put_many(
+                        missing_questions[start:start + len(embeddings)], embeddings
+                    )
             
-            for idx, row in enumerate(csv_reader):
-                # Generate embedding for the question
-                question_embedding = self._generate_text_embedding(row["question_clear"])
-                
-                # Create point structure for Qdrant
-                point = PointStruct(
-                    id=idx,
-                    vector=question_embedding,
-                    payload={
-                        "question_clear": row["question_clear"],
-                        "content_clear": row["content_clear"],
-                    }
-                )
-                points.append(point)
-                
-                if (idx + 1) % 100 == 0:
-                    logger.info(f"Processed {idx + 1} QA pairs")
+                for offset, question_embedding in enumerate(embeddings, start=start):
+                    pending_points.append(
+                        build_point(*hashed_rows[missing_indices[offset]], question_embedding)
+                    )
+                flush_full_chunks()
+            
+                embedded_count += len(embeddings)
+                elapsed = time.perf_counter() - started_at
+                logger.info(f"Embedded {embedded_count}/{len(missing_questions)} QA pairs "
+                            f"({embedded_count / elapsed:.1f} rows/s)")
         
-        logger.info(f"Upserting {len(points)} points to collection")
+            if pending_points:
+                upsert_tasks.append(asyncio.create_task(
+                    self._upsert_points(collection_name, pending_points)
+                ))
+            await asyncio.gather(*upsert_tasks)
+        except BaseException:
+            for task in upsert_tasks:
+                task.cancel()
+            await asyncio.gather(*upsert_tasks, return_exceptions=True)
+            raise
         
-        # Insert all points into the collection
-        self.qdrant_client.upsert(
-            collection_name=self.collection_name,
-            points=points
-        )
+        elapsed = time.perf_counter() - started_at
+        logger.info(f"Upserted {len(hashed_rows)} QA pairs into '{collection_name}' in "
+                    f"{elapsed:.1f}s ({len(hashed_rows) / elapsed:.1f} rows/s)")
+
+    async def _embed_query(self, query: str) -> list[float]:
+        """Embed the retrieval query, reusing recently computed embeddings.
         
-        logger.info("Collection population completed successfully")
+        Args:
+            query: Final retrieval string
+            
+        Returns:
+            Embedding of the query
+        """
+        return (await self._embed_queries([query]))[0]
 
-    def retrieve_similar_qa_pairs(self, query: str) -> list[dict]:
+    async def _embed_queries(self, queries: list[str]) -> list[list[float]]:
+        """Embed several retrieval queries with at most one embedder call.
+        
+        Args:
+            queries: Retrieval strings
+            
+        Returns:
+            Embeddings in the order of `queries`
+        """
+        query_embeddings = [self.query_embedding_cache.get(query) for query in queries]
+        missing_queries = [
+            query for query, query_embedding in zip(queries, query_embeddings)
+            if query_embedding is None
+        ]
+        
+        if missing_queries:
+            computed = dict(zip(
+                missing_queries, await self.embedding_client.embed_texts(missing_queries)
+            ))
+            for query, query_embedding in computed.items():
+                self.query_embedding_cache.set(query, query_embedding)
+            query_embeddings = [
+                query_embedding if query_embedding is not None else computed[query]
+                for query, query_embedding in zip(queries, query_embeddings)
+            ]
+        
+        return query_embeddings
+
+    async def retrieve_similar_qa_pairs(self, query: str) -> list[dict]:
         """Retrieve similar question-answer pairs for the given query.
         
         Args:
@@ -160,24 +646,74 @@ class RetrievalManager:
         """
         logger.info(f"Retrieving similar QA pairs for query: {query[:50]}...")
         
+        if not self.is_serving:
+            logger.error(f"Retrieval requested while index is {self.state}")
+            raise Exception(f"Retrieval index is not available ({self.state})")
+        
         # Generate embedding for the query
-        query_embedding = self._generate_text_embedding(query)
+        query_embedding = await self._embed_query(query)
         
         # Search for similar vectors in the collection
-        search_result = self.qdrant_client.query_points(
-            collection_name=self.collection_name,
+        points = await self.search_backend.search(
+            query_embedding, self.top_results_count, group_by=self.group_by
+        )
+        
+        logger.info(f"Retrieved {len(points)} similar QA pairs")
+        return points
+
+    async def retrieve_fused(
+        self, queries: list[str], weights: list[float]
+    ) -> list[tuple[ScoredPoint, float | None]]:
+        """Retrieve QA pairs for several queries and fuse the rankings.
+        
+        All queries are embedded in one embedder call and searched in one
+        batched search request; the result lists are combined with weighted
+        reciprocal rank fusion.
+        
+        Args:
+            queries: Search query texts, the current query first, followed
+                by e.g. earlier user messages
+            weights: Fusion weight of each query
+            
+        Returns:
+            Fused scored points, best first, each with its similarity to the
+            first query (None if only other queries retrieved it)
+        """
+        logger.info(f"Retrieving similar QA pairs for {len(queries)} fused queries")
+        
+        if not self.is_serving:
+            logger.error(f"Retrieval requested while index is {self.state}")
+            raise Exception(f"Retrieval index is not available ({self.state})")
+        
+        query_embeddings = await self._embed_queries(queries)
+        rankings = await self.search_backend.search_batch(
+            query_embeddings, self.top_results_count, group_by=self.group_by
+        )
+        points = reciprocal_rank_fusion(
+            rankings,
+            weights,
             limit=self.top_results_count,
-            query=query_embedding,
-            with_payload=True,
+            k=settings.workflow.RRF_K,
+            group_by=self.group_by,
         )
+        query_scores = {
+            fusion_key(point, self.group_by): point.score for point in rankings[0]
+        }
         
-        logger.info(f"Retrieved {len(search_result.points)} similar QA pairs")
-        return search_result.points
+        logger.info(f"Retrieved {len(points)} similar QA pairs after fusion")
+        return [
+            (point, query_scores.get(fusion_key(point, self.group_by))) for point in points
+        ]
 
     # Backward compatibility alias
-    def retrieve(self, query: str) -> list[dict]:
+    async def retrieve(self, query: str) -> list[dict]:
         """Backward compatibility method for retrieving similar QA pairs."""
-        return self.retrieve_similar_qa_pairs(query)
+        return await self.retrieve_similar_qa_pairs(query)
+
+    async def aclose(self):
+        """Release pooled connections held by the manager."""
+        await self.embedding_client.aclose()
+        await self.qdrant_client.close()
 
 
 # Singleton instance for global access
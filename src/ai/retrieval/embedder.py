@@ -0,0 +1,161 @@
+# Standard library imports
+import asyncio
+import logging
+from typing import AsyncIterator
+
+# External library imports
+import httpx
+
+# Internal module imports
+from src.settings import settings
+
+
+# Configure module-level logging
+logger = logging.getLogger(__name__)
+
+
+class EmbeddingClient:
+    """Async client for the OpenAI-compatible embeddings endpoint.
+    
+    The underlying `httpx.AsyncClient` is created on first use and kept for
+    the lifetime of the client, so requests reuse pooled keep-alive
+    connections to the embedder instead of opening a new one per call.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        model_name: str,
+        timeout: float = 30.0,
+        max_connections: int = 20,
+        max_keepalive_connections: int = 10,
+        keepalive_expiry: float = 30.0,
+    ):
+        """Configure the client without opening any connections.
+        
+        Args:
+            base_url: Base URL of the embeddings API (e.g. http://embedder:8000/v1)
+            model_name: Name of the embedding model
+            timeout: Request timeout in seconds
+            max_connections: Maximum number of concurrent connections
+            max_keepalive_connections: Maximum number of idle connections kept open
+            keepalive_expiry: Seconds an idle connection is kept open
+        """
+        self.endpoint = f"{base_url}/embeddings"
+        self.model_name = model_name
+        self.timeout = timeout
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+        )
+        self._http_client: httpx.AsyncClient | None = None
+
+    @classmethod
+    def from_settings(cls) -> "EmbeddingClient":
+        """Create a client configured from `EmbedderSettings`."""
+        return cls(
+            base_url=settings.embedder.API_BASE_URL,
+            model_name=settings.embedder.MODEL_NAME,
+            timeout=settings.embedder.TIMEOUT,
+            max_connections=settings.embedder.MAX_CONNECTIONS,
+            max_keepalive_connections=settings.embedder.MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=settings.embedder.KEEPALIVE_EXPIRY,
+        )
+
+    def _get_http_client(self) -> httpx.AsyncClient:
+        if self._http_client is None:
+            self._http_client = httpx.AsyncClient(
+                timeout=self.timeout,
+                limits=self.limits,
+                headers={"Content-Type": "application/json"},
+            )
+            logger.info(f"Opened embedder connection pool to {self.endpoint}")
+        return self._http_client
+
+    async def embed_texts(self, texts: list[str]) -> list[list[float]]:
+        """Generate embeddings for the given texts in a single request.
+        
+        Args:
+            texts: Input texts to embed
+            
+        Returns:
+            List of embeddings, in the same order as the texts
+            
+        Raises:
+            Exception: If the embedding API call fails
+        """
+        payload = {"model": self.model_name, "input": texts}
+        
+        logger.debug(f"Generating embeddings for {len(texts)} texts")
+        
+        response = await self._get_http_client().post(self.endpoint, json=payload)
+        response_data = response.json()
+        
+        if response.status_code == 200:
+            embeddings = [
+                item["embedding"]
+                for item in sorted(response_data.get("data", []), key=lambda item: item.get("index", 0))
+            ]
+            logger.debug(f"Generated {len(embeddings)} embeddings")
+            return embeddings
+        else:
+            error_msg = f"Embeddings API error: {response.status_code} - {response_data}"
+            logger.error(error_msg)
+            raise Exception(error_msg)
+
+    async def embed_text(self, text: str) -> list[float]:
+        """Generate embedding for the given text.
+        
+        Args:
+            text: Input text to embed
+            
+        Returns:
+            List of float values representing the text embedding
+        """
+        logger.debug(f"Generating embedding for text: {text[:50]}...")
+        return (await self.embed_texts([text]))[0]
+
+    async def embed_texts_in_batches(
+        self, texts: list[str], batch_size: int, concurrency: int
+    ) -> AsyncIterator[tuple[int, list[list[float]]]]:
+        """Embed texts in batches with a bounded number of concurrent requests.
+        
+        Args:
+            texts: Input texts to embed
+            batch_size: Number of texts sent in one request
+            concurrency: Maximum number of requests in flight
+            
+        Yields:
+            Tuples of (offset of the batch in `texts`, batch embeddings),
+            in completion order
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def embed_batch(start: int) -> tuple[int, list[list[float]]]:
+            async with semaphore:
+                return start, await self.embed_texts(texts[start:start + batch_size])
+
+        tasks = [
+            asyncio.create_task(embed_batch(start))
+            for start in range(0, len(texts), batch_size)
+        ]
+        try:
+            for next_completed in asyncio.as_completed(tasks):
+                yield await next_completed
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def aclose(self):
+        """Close pooled connections."""
+        if self._http_client is not None:
+            await self._http_client.aclose()
+            self._http_client = None
+            logger.info("Closed embedder connection pool")
+
+    async def __aenter__(self) -> "EmbeddingClient":
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.aclose()
@@ -0,0 +1,165 @@
+# Standard library imports
+import hashlib
+import json
+import logging
+import os
+import threading
+
+# External library imports
+import numpy as np
+
+
+# Configure module-level logging
+logger = logging.getLogger(__name__)
+
+
+def hash_text(text: str) -> str:
+    """Return the hex SHA-256 digest of the text."""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class EmbeddingStore:
+    """Persistent on-disk cache of embeddings for a single embedding model.
+    
+    Vectors are appended to a raw float32 file that is read through a
+    memory map, and an index file maps text hashes to row numbers. Files
+    are named after a hash of the model name, so embeddings of different
+    models never mix.
+    """
+
+    def __init__(self, directory: str, model_name: str):
+        """Open (or create) the store for the model.
+        
+        Args:
+            directory: Directory holding the store files
+            model_name: Name of the embedding model the vectors come from
+        """
+        self.model_name = model_name
+        self.hits = 0
+        self.misses = 0
+
+        os.makedirs(directory, exist_ok=True)
+        file_stem = os.path.join(directory, hash_text(model_name)[:16])
+        self.vectors_path = f"{file_stem}.f32"
+        self.index_path = f"{file_stem}.index.json"
+
+        self.dimension: int | None = None
+        self.rows: dict[str, int] = {}
+        self._vectors: np.memmap | None = None
+        self._lock = threading.Lock()
+
+        self._load_index()
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def _load_index(self):
+        if os.path.exists(self.index_path):
+            with open(self.index_path, encoding="utf-8") as index_file:
+                index = json.load(index_file)
+
+            self.dimension = index["dimension"]
+            self.rows = index["rows"]
+            logger.info(f"Opened embedding store for model '{self.model_name}' with "
+                        f"{len(self.rows)} vectors of dimension {self.dimension}")
+        else:
+            logger.info(f"Creating embedding store for model '{self.model_name}' "
+                        f"at {self.vectors_path}")
+
+        # Drop vectors appended by a write whose index update never finished
+        indexed_size = len(self.rows) * (self.dimension or 0) * np.dtype(np.float32).itemsize
+        if os.path.exists(self.vectors_path) and os.path.getsize(self.vectors_path) > indexed_size:
+            logger.warning("Truncating unindexed vectors left by an interrupted write")
+            with open(self.vectors_path, "r+b") as vectors_file:
+                vectors_file.truncate(indexed_size)
+
+    def _save_index(self):
+        index = {
+            "model_name": self.model_name,
+            "dimension": self.dimension,
+            "rows": self.rows,
+        }
+        tmp_path = f"{self.index_path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as index_file:
+            json.dump(index, index_file)
+        os.replace(tmp_path, self.index_path)
+
+    def _get_vectors(self) -> np.memmap:
+        if self._vectors is None or len(self._vectors) < len(self.rows):
+            self._vectors = np.memmap(
+                self.vectors_path, dtype=np.float32, mode="r",
+                shape=(len(self.rows), self.dimension),
+            )
+        return self._vectors
+
+    def get_many(self, texts: list[str]) -> list[list[float] | None]:
+        """Look up cached embeddings of the texts.
+        
+        Args:
+            texts: Texts to look up
+            
+        Returns:
+            Embedding for each text, or None where the text was never stored
+        """
+        with self._lock:
+            row_numbers = [self.rows.get(hash_text(text)) for text in texts]
+            vectors = self._get_vectors() if self.rows else None
+
+            embeddings = [
+                None if row_number is None else vectors[row_number].tolist()
+                for row_number in row_numbers
+            ]
+
+            found_count = sum(row_number is not None for row_number in row_numbers)
+            self.hits += found_count
+            self.misses += len(texts) - found_count
+            return embeddings
+
+    def put_many(self, texts: list[str], embeddings: list[list[float]]):
+        """Persist embeddings of texts that are not stored yet.
+        
+        Args:
+            texts: Embedded texts
+            embeddings: Embeddings of the texts, in the same order
+        """
+        with self._lock:
+            new_rows = {}
+            for text, embedding in zip(texts, embeddings):
+                text_hash = hash_text(text)
+                if text_hash not in self.rows and text_hash not in new_rows:
+                    new_rows[text_hash] = embedding
+
+            if not new_rows:
+                return
+
+            vectors = np.asarray(list(new_rows.values()), dtype=np.float32)
+            if self.dimension is None:
+                self.dimension = vectors.shape[1]
+            elif vectors.shape[1] != self.dimension:
+                raise ValueError(
+                    f"Embedding dimension {vectors.shape[1]} does not match "
+                    f"store dimension {self.dimension}"
+                )
+
+            # Vectors are written before the index that references them
+            with open(self.vectors_path, "ab") as vectors_file:
+                vectors_file.write(vectors.tobytes())
+
+            first_row = len(self.rows)
+            for offset, text_hash in enumerate(new_rows):
+                self.rows[text_hash] = first_row + offset
+            self._save_index()
+
+    def stats(self) -> dict:
+        """Return size and hit/miss statistics of the store.
+        
+        Returns:
+            Dictionary with size, hits, misses and hit_ratio
+        """
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self.rows),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+        }
@@ -0,0 +1,69 @@
+# Standard library imports
+import logging
+from typing import Iterable, Literal
+
+# Internal module imports
+from src.preprocessing import preprocess_query_texts
+
+
+# Configure module-level logging
+logger = logging.getLogger(__name__)
+
+
+class ExactMatchIndex:
+    """Hash index from normalized knowledge-base questions to their answers.
+    
+    Questions are normalized with the same pipeline as incoming queries, so
+    a cleaned query that equals a known question can be answered directly
+    with the stored answer.
+    """
+
+    def __init__(self):
+        """Initialize an empty index."""
+        self.answers_by_question: dict[str, list[str]] = {}
+
+    def __len__(self) -> int:
+        return len(self.answers_by_question)
+
+    def build(self, payloads: Iterable[dict]):
+        """Replace the index contents with the given point payloads.
+        
+        Args:
+            payloads: Payloads with `question_clear` and `content_clear` fields
+        """
+        payloads = list(payloads)
+        normalized_questions = preprocess_query_texts(
+            (payload["question_clear"] for payload in payloads), workers=1
+        )
+        
+        answers_by_question = {}
+        for normalized_question, payload in zip(normalized_questions, payloads):
+            # Questions reduced to nothing would match every empty query
+            if not normalized_question:
+                continue
+            answers = answers_by_question.setdefault(normalized_question, [])
+            if payload["content_clear"] not in answers:
+                answers.append(payload["content_clear"])
+        
+        self.answers_by_question = answers_by_question
+        ambiguous_count = sum(len(answers) > 1 for answers in answers_by_question.values())
+        logger.info(f"Built exact-match index with {len(answers_by_question)} questions "
+                    f"({ambiguous_count} with several distinct answers)")
+
+    def lookup(self, query_clean: str, policy: Literal["unique", "first"]) -> str | None:
+        """Find the stored answer for a cleaned query.
+        
+        Args:
+            query_clean: Query after preprocessing
+            policy: `unique` answers only if the question has a single
+                distinct answer, `first` takes the first stored answer
+                
+        Returns:
+            Stored answer, or None if the shortcut does not apply
+        """
+        answers = self.answers_by_question.get(query_clean)
+        if not answers:
+            return None
+        if policy == "unique" and len(answers) > 1:
+            return None
+        return answers[0]
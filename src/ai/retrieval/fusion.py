@@ -0,0 +1,98 @@
+# Standard library imports
+import logging
+
+# External library imports
+from qdrant_client.http.models import ScoredPoint
+
+
+# Configure module-level logging
+logger = logging.getLogger(__name__)
+
+
+def recency_weights(count: int, decay: float) -> list[float]:
+    """Return rank-fusion weights for queries ordered from newest to oldest.
+    
+    Args:
+        count: Number of queries
+        decay: Factor applied per step back in the conversation
+        
+    Returns:
+        Weights `1, decay, decay**2, ...`
+    """
+    return [decay ** age for age in range(count)]
+
+
+def fusion_key(point: ScoredPoint, group_by: str | None = None):
+    """Return the key identifying a point across rankings.
+    
+    Args:
+        point: Scored point
+        group_by: Payload field shared by points treated as one result
+        
+    Returns:
+        Point id, or the group value if grouping is enabled
+    """
+    return point.id if group_by is None else point.payload.get(group_by, point.id)
+
+
+def reciprocal_rank_fusion(
+    rankings: list[list[ScoredPoint]],
+    weights: list[float],
+    limit: int,
+    k: int = 60,
+    group_by: str | None = None,
+) -> list[ScoredPoint]:
+    """Fuse several ranked result lists with weighted reciprocal rank fusion.
+    
+    Each point gets `sum(weight / (k + rank))` over the lists it appears in
+    (rank starting at 1). The returned points keep their best similarity
+    score from any list, but are ordered by the fused score.
+    
+    Args:
+        rankings: Result lists, best match first
+        weights: Weight of each list
+        limit: Maximum number of points to return
+        k: Smoothing constant damping the influence of top ranks
+        group_by: Payload field to fuse on instead of the point id, so
+            different points of one group add up and only the best one
+            is returned
+        
+    Returns:
+        Fused points, best first
+    """
+    fused_scores = {}
+    best_points = {}
+    
+    for ranking, weight in zip(rankings, weights):
+        for rank, point in enumerate(ranking, start=1):
+            key = fusion_key(point, group_by)
+            fused_scores[key] = fused_scores.get(key, 0.0) + weight / (k + rank)
+            if key not in best_points or point.score > best_points[key].score:
+                best_points[key] = point
+    
+    fused_keys = sorted(fused_scores, key=fused_scores.get, reverse=True)[:limit]
+    return [best_points[key] for key in fused_keys]
+
+
+def collapse_groups(points: list[ScoredPoint], group_by: str, limit: int) -> list[ScoredPoint]:
+    """Keep the best point of each group, preserving the ranking order.
+    
+    Args:
+        points: Scored points, best match first
+        group_by: Payload field identifying the group
+        limit: Maximum number of points to return
+        
+    Returns:
+        At most `limit` points with distinct groups
+    """
+    seen_groups = set()
+    collapsed = []
+    for point in points:
+        group = point.payload.get(group_by, point.id)
+        if group in seen_groups:
+            continue
+        seen_groups.add(group)
+        collapsed.append(point)
+        if len(collapsed) == limit:
+            break
+    return collapsed
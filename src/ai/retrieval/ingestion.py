@@ -0,0 +1,127 @@
+# Standard library imports
+import csv
+import hashlib
+import logging
+import os
+import uuid
+
+# External library imports
+from qdrant_client.http.models import PointStruct
+
+# Internal module imports
+from src.preprocessing import compute_simhash, estimate_token_count
+from src.settings import settings
+
+
+# Configure module-level logging
+logger = logging.getLogger(__name__)
+
+# Knowledge base shipped with the service
+QA_PAIRS_CSV_PATH = os.path.join(
+    os.path.dirname(__file__), "resources", "qa_df_pairs_db.csv"
+)
+
+
+def load_qa_pairs(csv_file_path: str = QA_PAIRS_CSV_PATH) -> list[dict[str, str]]:
+    """Load question-answer rows from the knowledge base CSV file.
+    
+    Args:
+        csv_file_path: Path to the CSV file with `question_clear` and
+            `content_clear` columns
+            
+    Returns:
+        List of rows as dictionaries
+    """
+    logger.info(f"Loading QA pairs from {csv_file_path}")
+    
+    with open(csv_file_path, newline='', encoding='utf-8') as csvfile:
+        rows = list(csv.DictReader(csvfile))
+    
+    logger.info(f"Loaded {len(rows)} QA pairs")
+    return rows
+
+
+# Bump when the payload layout changes, so every row is re-upserted
+PAYLOAD_SCHEMA_VERSION = 4
+
+# Payload field shared by all questions with the same canonical answer
+ANSWER_GROUP_FIELD = "answer_group"
+
+# Payload field with the SimHash of the answer, for near-duplicate collapsing
+ANSWER_SIGNATURE_FIELD = "answer_signature"
+
+# Payload field with the estimated prompt tokens of the QA pair
+TOKEN_COUNT_FIELD = "token_count"
+
+# Payload fields read at query time; bookkeeping fields stay on the server
+SEARCH_PAYLOAD_FIELDS = [
+    "question_clear",
+    "content_clear",
+    ANSWER_GROUP_FIELD,
+    ANSWER_SIGNATURE_FIELD,
+    TOKEN_COUNT_FIELD,
+]
+
+
+def compute_row_hash(row: dict[str, str]) -> str:
+    """Return the content hash identifying a knowledge base row.
+    
+    Args:
+        row: CSV row with `question_clear` and `content_clear`
+        
+    Returns:
+        Hex SHA-256 digest of the row content and payload schema version
+    """
+    content = "\x1f".join(
+        (str(PAYLOAD_SCHEMA_VERSION), row["question_clear"], row["content_clear"])
+    )
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+
+def compute_answer_group(answer: str) -> str:
+    """Return the answer-group id of a knowledge base answer.
+    
+    Answers that differ only in case or whitespace share a group.
+    
+    Args:
+        answer: Cleaned answer text
+        
+    Returns:
+        Short hex digest identifying the canonical answer
+    """
+    canonical_answer = " ".join(answer.lower().split())
+    return hashlib.sha256(canonical_answer.encode("utf-8")).hexdigest()[:16]
+
+
+def row_hash_to_point_id(row_hash: str) -> str:
+    """Derive a deterministic Qdrant point id (UUID) from a row hash."""
+    return str(uuid.UUID(hex=row_hash[:32]))
+
+
+def build_point(row: dict[str, str], row_hash: str, vector: list[float]) -> PointStruct:
+    """Create the Qdrant point for a knowledge base row.
+    
+    Args:
+        row: CSV row with question and answer
+        row_hash: Content hash of the row
+        vector: Embedding of the question
+        
+    Returns:
+        Point structure for Qdrant
+    """
+    return PointStruct(
+        id=row_hash_to_point_id(row_hash),
+        vector=vector,
+        payload={
+            "question_clear": row["question_clear"],
+            "content_clear": row["content_clear"],
+            ANSWER_GROUP_FIELD: compute_answer_group(row["content_clear"]),
+            ANSWER_SIGNATURE_FIELD: compute_simhash(row["content_clear"]),
+            TOKEN_COUNT_FIELD: (
+                estimate_token_count(row["question_clear"])
+                + estimate_token_count(row["content_clear"])
+            ),
+            "content_hash": row_hash,
+            "embedder_model": settings.embedder.MODEL_NAME,
+        }
+    )
@@ -0,0 +1,471 @@
+# Standard library imports
+import asyncio
+import logging
+import math
+import os
+import tempfile
+import time
+from abc import ABC, abstractmethod
+from typing import Literal
+
+# External library imports
+import numpy as np
+from qdrant_client import AsyncQdrantClient
+from qdrant_client.http.models import (
+    QuantizationSearchParams,
+    QueryRequest,
+    ScoredPoint,
+    SearchParams,
+)
+
+# Internal module imports
+from .fusion import collapse_groups
+
+
+# Configure module-level logging
+logger = logging.getLogger(__name__)
+
+
+class SearchBackend(ABC):
+    """Nearest-neighbour search over the question embeddings of a collection."""
+
+    @abstractmethod
+    async def search(
+        self, query_vector: list[float], limit: int, group_by: str | None = None
+    ) -> list[ScoredPoint]:
+        """Find the points most similar to the query vector.
+        
+        Args:
+            query_vector: Query embedding
+            limit: Maximum number of points to return
+            group_by: Payload field; if set, only the best point of each
+                distinct value is returned
+            
+        Returns:
+            Scored points with payloads, best match first
+        """
+
+    async def search_batch(
+        self, query_vectors: list[list[float]], limit: int, group_by: str | None = None
+    ) -> list[list[ScoredPoint]]:
+        """Run several searches, one result list per query vector.
+        
+        Args:
+            query_vectors: Query embeddings
+            limit: Maximum number of points per query
+            group_by: Payload field; if set, only the best point of each
+                distinct value is returned
+            
+        Returns:
+            Scored points for each query, in the order of `query_vectors`
+        """
+        return [
+            await self.search(query_vector, limit, group_by) for query_vector in query_vectors
+        ]
+
+    async def search_exact(self, query_vector: list[float], limit: int) -> list[ScoredPoint]:
+        """Find the most similar points using full-precision vectors only.
+        
+        Used as the reference when measuring the recall of quantized search.
+        """
+        return await self.search(query_vector, limit)
+
+    @abstractmethod
+    async def sample_vectors(self, count: int) -> list[list[float]]:
+        """Return up to `count` stored vectors to use as benchmark queries."""
+
+    async def compare_with_exact(self, limit: int, sample_size: int = 100) -> dict:
+        """Measure recall and latency of `search` against `search_exact`.
+        
+        Stored vectors are used as queries, so no embedder calls are needed.
+        
+        Args:
+            limit: Number of results compared per query (recall@limit)
+            sample_size: Number of benchmark queries
+            
+        Returns:
+            Dictionary with query count, recall and mean latencies in ms
+        """
+        query_vectors = await self.sample_vectors(sample_size)
+        recall_sum = 0.0
+        search_seconds = 0.0
+        exact_seconds = 0.0
+        
+        for query_vector in query_vectors:
+            started_at = time.perf_counter()
+            found = await self.search(query_vector, limit)
+            search_seconds += time.perf_counter() - started_at
+            
+            started_at = time.perf_counter()
+            expected = await self.search_exact(query_vector, limit)
+            exact_seconds += time.perf_counter() - started_at
+            
+            expected_ids = {point.id for point in expected}
+            if expected_ids:
+                recall_sum += len(expected_ids & {point.id for point in found}) / len(expected_ids)
+        
+        query_count = max(len(query_vectors), 1)
+        return {
+            "queries": len(query_vectors),
+            "recall": recall_sum / query_count,
+            "search_ms": 1000 * search_seconds / query_count,
+            "exact_ms": 1000 * exact_seconds / query_count,
+        }
+
+
+class QdrantSearchBackend(SearchBackend):
+    """Search backend delegating every query to the Qdrant server."""
+
+    def __init__(
+        self,
+        qdrant_client: AsyncQdrantClient,
+        collection_name: str,
+        rescore_oversampling: float | None = None,
+        payload_fields: list[str] | None = None,
+        group_oversampling: float = 5.0,
+    ):
+        """Initialize the backend.
+        
+        Args:
+            qdrant_client: Async client connected to the Qdrant server
+            collection_name: Name of the collection to search
+            rescore_oversampling: Oversampling factor for rescoring quantized
+                candidates with original vectors, or None if the collection
+                is not quantized
+            payload_fields: Payload fields returned with each point (all
+                fields if None)
+            group_oversampling: Points fetched per requested group in
+                batched grouped searches, which are collapsed in-process
+        """
+        self.qdrant_client = qdrant_client
+        self.collection_name = collection_name
+        self.with_payload = payload_fields if payload_fields is not None else True
+        self.group_oversampling = group_oversampling
+        self.search_params = None
+        if rescore_oversampling is not None:
+            self.search_params = SearchParams(
+                quantization=QuantizationSearchParams(
+                    rescore=True, oversampling=rescore_oversampling
+                )
+            )
+
+    async def search(
+        self, query_vector: list[float], limit: int, group_by: str | None = None
+    ) -> list[ScoredPoint]:
+        if group_by is not None:
+            groups_result = await self.qdrant_client.query_points_groups(
+                collection_name=self.collection_name,
+                group_by=group_by,
+                query=query_vector,
+                search_params=self.search_params,
+                limit=limit,
+                group_size=1,
+                with_payload=self.with_payload,
+            )
+            return [group.hits[0] for group in groups_result.groups]
+        
+        search_result = await self.qdrant_client.query_points(
+            collection_name=self.collection_name,
+            limit=limit,
+            query=query_vector,
+            search_params=self.search_params,
+            with_payload=self.with_payload,
+        )
+        return search_result.points
+
+    async def search_batch(
+        self, query_vectors: list[list[float]], limit: int, group_by: str | None = None
+    ) -> list[list[ScoredPoint]]:
+        # All queries go to Qdrant in a single request. The groups API has no
+        # batch form, so grouped batches over-fetch and collapse in-process
+        fetch_limit = limit if group_by is None else math.ceil(limit * self.group_oversampling)
+        responses = await self.qdrant_client.query_batch_points(
+            collection_name=self.collection_name,
+            requests=[
+                QueryRequest(
+                    query=query_vector,
+                    limit=fetch_limit,
+                    params=self.search_params,
+                    with_payload=self.with_payload,
+                )
+                for query_vector in query_vectors
+            ],
+        )
+        if group_by is None:
+            return [response.points for response in responses]
+        return [collapse_groups(response.points, group_by, limit) for response in responses]
+
+    async def search_exact(self, query_vector: list[float], limit: int) -> list[ScoredPoint]:
+        search_result = await self.qdrant_client.query_points(
+            collection_name=self.collection_name,
+            limit=limit,
+            query=query_vector,
+            search_params=SearchParams(
+                exact=True, quantization=QuantizationSearchParams(ignore=True)
+            ),
+            with_payload=self.with_payload,
+        )
+        return search_result.points
+
+    async def sample_vectors(self, count: int) -> list[list[float]]:
+        points, _ = await self.qdrant_client.scroll(
+            collection_name=self.collection_name,
+            limit=count,
+            with_payload=False,
+            with_vectors=True,
+        )
+        return [point.vector for point in points]
+
+
+class NumpySearchBackend(SearchBackend):
+    """In-process exact cosine search over a contiguous normalized matrix.
+    
+    The whole collection is loaded from Qdrant once; each query is then a
+    single matrix-vector product followed by `argpartition`, without a
+    network hop. Suited for small knowledge bases.
+    
+    With `float16` or `int8` precision only the compact matrix (plus one
+    scale per vector for `int8`) is kept in memory. Full-precision vectors
+    are written to a memory-mapped file and read back only for the small
+    candidate set that is rescored in float32.
+    """
+
+    def __init__(
+        self,
+        precision: Literal["float32", "float16", "int8"] = "float32",
+        rescore_oversampling: float = 2.0,
+        rescore_dir: str | None = None,
+        block_size: int = 8192,
+    ):
+        """Initialize an empty backend; call `load` before searching.
+        
+        Args:
+            precision: Storage type of the in-memory matrix
+            rescore_oversampling: Candidates rescored per requested result
+                when the matrix is quantized
+            rescore_dir: Directory for the full-precision vector file
+                (system temporary directory by default)
+            block_size: Rows dequantized at once while scoring
+        """
+        self.precision = precision
+        self.rescore_oversampling = rescore_oversampling
+        self.rescore_dir = rescore_dir
+        self.block_size = block_size
+        
+        self.matrix = np.empty((0, 0), dtype=np.float32)
+        self.scales: np.ndarray | None = None
+        self.full_precision_matrix = self.matrix
+        self.point_ids: list = []
+        self.payloads: list[dict] = []
+        self.group_codes: dict[str, np.ndarray] = {}
+
+    @property
+    def nbytes(self) -> int:
+        """Memory held by the in-memory search matrix and scales."""
+        return self.matrix.nbytes + (self.scales.nbytes if self.scales is not None else 0)
+
+    async def load(
+        self,
+        qdrant_client: AsyncQdrantClient,
+        collection_name: str,
+        page_size: int = 1024,
+        payload_fields: list[str] | None = None,
+        vector_size: int | None = None,
+    ):
+        """Load all vectors and payloads of the collection into memory.
+        
+        Args:
+            qdrant_client: Async client connected to the Qdrant server
+            collection_name: Name of the collection to load
+            page_size: Number of points fetched per scroll request
+            payload_fields: Payload fields kept in memory (all fields if None)
+            vector_size: Vector dimension, used if the collection is empty
+        """
+        vectors = []
+        point_ids = []
+        payloads = []
+        
+        next_offset = None
+        while True:
+            points, next_offset = await qdrant_client.scroll(
+                collection_name=collection_name,
+                limit=page_size,
+                offset=next_offset,
+                with_payload=payload_fields if payload_fields is not None else True,
+                with_vectors=True,
+            )
+            for point in points:
+                vectors.append(point.vector)
+                point_ids.append(point.id)
+                payloads.append(point.payload)
+            if next_offset is None:
+                break
+        
+        # Normalizing and quantizing the matrix is CPU-bound
+        await asyncio.to_thread(self.set_points, point_ids, vectors, payloads, vector_size)
+        logger.info(f"Loaded {len(point_ids)} vectors from '{collection_name}' "
+                    f"into {self.precision} in-process index "
+                    f"({self.nbytes / 2**20:.1f} MiB)")
+
+    def set_points(
+        self,
+        point_ids: list,
+        vectors: list[list[float]],
+        payloads: list[dict],
+        vector_size: int | None = None,
+    ):
+        """Replace the index contents.
+        
+        Args:
+            point_ids: Point identifiers
+            vectors: Point vectors, in the same order
+            payloads: Point payloads, in the same order
+            vector_size: Vector dimension, used if there are no points
+        """
+        self.point_ids = list(point_ids)
+        self.payloads = list(payloads)
+        self.group_codes = {}
+        
+        if not self.point_ids:
+            # Nothing to quantize or map; searches return no hits
+            self.matrix = np.empty((0, vector_size or 0), dtype=np.float32)
+            self.scales = None
+            self.full_precision_matrix = self.matrix
+            return
+        
+        matrix = np.asarray(vectors, dtype=np.float32).reshape(len(point_ids), -1)
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        matrix = np.ascontiguousarray(matrix / np.maximum(norms, 1e-12))
+        
+        if self.precision == "float32":
+            self.matrix = matrix
+            self.scales = None
+            self.full_precision_matrix = matrix
+        else:
+            self.full_precision_matrix = self._write_full_precision(matrix)
+            if self.precision == "int8":
+                scales = np.abs(matrix).max(axis=1) / 127.0
+                self.scales = np.maximum(scales, 1e-12).astype(np.float32)
+                self.matrix = np.rint(matrix / self.scales[:, None]).astype(np.int8)
+            else:
+                self.scales = None
+                self.matrix = matrix.astype(np.float16)
+
+    def _get_group_codes(self, group_by: str) -> np.ndarray:
+        """Return one integer code per point for the values of a payload field."""
+        if group_by not in self.group_codes:
+            code_by_value = {}
+            self.group_codes[group_by] = np.fromiter(
+                (
+                    code_by_value.setdefault(payload.get(group_by, idx), len(code_by_value))
+                    for idx, payload in enumerate(self.payloads)
+                ),
+                dtype=np.int64,
+                count=len(self.payloads),
+            )
+        return self.group_codes[group_by]
+
+    def _write_full_precision(self, matrix: np.ndarray) -> np.ndarray:
+        """Move the float32 matrix to a memory-mapped file and return the map."""
+        with tempfile.NamedTemporaryFile(
+            dir=self.rescore_dir, prefix="rescore-", suffix=".f32", delete=False
+        ) as rescore_file:
+            rescore_file.write(matrix.tobytes())
+        full_precision_matrix = np.memmap(
+            rescore_file.name, dtype=np.float32, mode="r", shape=matrix.shape
+        )
+        # The mapping stays valid after unlinking; the file goes away with it
+        os.unlink(rescore_file.name)
+        return full_precision_matrix
+
+    @staticmethod
+    def _normalize_query(query_vector: list[float]) -> np.ndarray:
+        query = np.asarray(query_vector, dtype=np.float32)
+        return query / max(float(np.linalg.norm(query)), 1e-12)
+
+    def _score_blocks(self, matrix: np.ndarray, query: np.ndarray, scales: np.ndarray | None) -> np.ndarray:
+        """Score all rows block by block to bound temporary float32 copies."""
+        if matrix.dtype == np.float32 and not isinstance(matrix, np.memmap):
+            return matrix @ query
+        
+        scores = np.empty(len(matrix), dtype=np.float32)
+        for start in range(0, len(matrix), self.block_size):
+            block = np.asarray(matrix[start:start + self.block_size], dtype=np.float32)
+            scores[start:start + len(block)] = block @ query
+        if scales is not None:
+            scores *= scales
+        return scores
+
+    @staticmethod
+    def _top_indices(scores: np.ndarray, limit: int) -> np.ndarray:
+        """Return indices of the `limit` best scores, best first."""
+        limit = min(limit, len(scores))
+        if limit <= 0:
+            return np.empty(0, dtype=np.int64)
+        top_indices = np.argpartition(-scores, limit - 1)[:limit]
+        return top_indices[np.argsort(-scores[top_indices])]
+
+    def _top_distinct_indices(
+        self, scores: np.ndarray, limit: int, group_codes: np.ndarray
+    ) -> np.ndarray:
+        """Return indices of the best-scoring point of the `limit` best groups, best first."""
+        order = np.argsort(-scores, kind="stable")
+        _, first_positions = np.unique(group_codes[order], return_index=True)
+        return order[np.sort(first_positions)[:limit]]
+
+    def _to_scored_points(self, indices: np.ndarray, scores: np.ndarray) -> list[ScoredPoint]:
+        return [
+            ScoredPoint(
+                id=self.point_ids[idx],
+                version=0,
+                score=float(score),
+                payload=self.payloads[idx],
+            )
+            for idx, score in zip(indices.tolist(), scores.tolist())
+        ]
+
+    async def search(
+        self, query_vector: list[float], limit: int, group_by: str | None = None
+    ) -> list[ScoredPoint]:
+        if not self.point_ids:
+            return []
+        
+        query = self._normalize_query(query_vector)
+        group_codes = self._get_group_codes(group_by) if group_by is not None else None
+        
+        if self.precision == "float32":
+            scores = self.matrix @ query
+            if group_codes is not None:
+                top_indices = self._top_distinct_indices(scores, limit, group_codes)
+            else:
+                top_indices = self._top_indices(scores, limit)
+            return self._to_scored_points(top_indices, scores[top_indices])
+        
+        # Shortlist with the compact matrix, then rescore in float32
+        approximate_scores = self._score_blocks(self.matrix, query, self.scales)
+        candidate_count = math.ceil(limit * self.rescore_oversampling)
+        if group_codes is not None:
+            candidates = np.sort(
+                self._top_distinct_indices(approximate_scores, candidate_count, group_codes)
+            )
+        else:
+            candidates = np.sort(self._top_indices(approximate_scores, candidate_count))
+        
+        rescored = np.asarray(self.full_precision_matrix[candidates], dtype=np.float32) @ query
+        best = self._top_indices(rescored, limit)
+        return self._to_scored_points(candidates[best], rescored[best])
+
+    async def search_exact(self, query_vector: list[float], limit: int) -> list[ScoredPoint]:
+        if not self.point_ids:
+            return []
+        
+        query = self._normalize_query(query_vector)
+        scores = self._score_blocks(self.full_precision_matrix, query, None)
+        top_indices = self._top_indices(scores, limit)
+        return self._to_scored_points(top_indices, scores[top_indices])
+
+    async def sample_vectors(self, count: int) -> list[list[float]]:
+        if not self.point_ids:
+            return []
+        step = max(len(self.point_ids) // count, 1)
+        return np.asarray(self.full_precision_matrix[::step][:count]).tolist()
@@ -11,6 +11,7 @@ from llama_index.core.workflow import (
 )
 
 # Internal module imports
+from src.settings import settings
 from .workflow_events import (
     DeduplicateEvent,
     HasQAExamplesEvent,
@@ -19,11 +20,13 @@ from .workflow_events import (
     SanityCheckEvent,
 )
 from .workflow_steps.deduplicate import deduplicate_step
+from .workflow_steps.exact_match import exact_match_step
 from .workflow_steps.preprocess import preprocess_step
 from .workflow_steps.qa_examples import is_there_qa_examples_step
 from .workflow_steps.reply import reply_step
 from .workflow_steps.retrieve import retrieve_step
 from .workflow_steps.sanity_check import sanity_check_step
+from .workflow_steps.speculative_reply import speculative_sanity_check_step
 
 
 # Configure module-level logging
@@ -56,16 +59,25 @@ class AssistantFlow(Workflow):
         return await preprocess_step(ev)
 
     @step
-    async def retrieve(self, ev: PreprocessEvent, ctx: Context) -> RetrieveEvent:
+    async def retrieve(self, ev: PreprocessEvent, ctx: Context) -> RetrieveEvent | StopEvent:
         """Retrieve relevant question-answer pairs from the database.
         
+        Queries that exactly match a known question are answered right away
+        with the stored answer, skipping retrieval and both LLM steps, unless
+        the conversation already has history.
+        
         Args:
             ev: PreprocessEvent containing the cleaned query
             ctx: Workflow context containing shared data
             
         Returns:
-            RetrieveEvent containing retrieved QA pairs
+            RetrieveEvent containing retrieved QA pairs, or StopEvent with
+            the stored answer for an exact match
         """
+        exact_match_result = await exact_match_step(ev, ctx)
+        if exact_match_result is not None:
+            return exact_match_result
+        
         logger.info("Starting question-answer retrieval step")
         return await retrieve_step(ev, ctx)
 
@@ -86,14 +98,20 @@ class AssistantFlow(Workflow):
     async def sanity_check(self, ev: DeduplicateEvent, ctx: Context) -> SanityCheckEvent:
         """Perform sanity checks on the deduplicated question-answer pairs.
         
+        With `WorkflowSettings.SPECULATIVE_REPLY` the reply is generated
+        concurrently with the check and passed on if the prediction holds.
+        
         Args:
             ev: DeduplicateEvent containing deduplicated QA pairs
             ctx: Workflow context containing shared data
             
         Returns:
-            SanityCheckEvent containing validated QA pairs
+            SanityCheckEvent containing validated QA pairs and, on a
+            speculation hit, the reply
         """
         logger.info("Starting sanity check step")
+        if settings.workflow.SPECULATIVE_REPLY:
+            return await speculative_sanity_check_step(ev, ctx)
         return await sanity_check_step(ev, ctx)
 
     @step
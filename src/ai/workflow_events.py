@@ -1,8 +1,13 @@
 # Standard library imports
 import logging
+from typing import Literal
 
 # External library imports
 from llama_index.core.workflow import Event
+from pydantic import BaseModel
+
+# Internal module imports
+from src.preprocessing import estimate_token_count
 
 
 # Configure module-level logging
@@ -15,25 +20,67 @@ class PreprocessEvent(Event):
     query_clean: str
 
 
+class RetrievedDocument(BaseModel):
+    """Question-answer pair retrieved from the knowledge base."""
+    
+    question: str
+    answer: str
+    score: float  # Similarity to the query (best one across fused queries)
+    query_score: float | None = None  # Similarity to the current query; None if found via history only
+    point_id: int | str
+    answer_signature: str | None = None  # SimHash of the answer, see `compute_simhash`
+    token_count: int | None = None  # Estimated prompt tokens of question and answer
+    
+    def prompt_tokens(self) -> int:
+        """Return the prompt tokens of the document, estimating them if not stored."""
+        if self.token_count is not None:
+            return self.token_count
+        return estimate_token_count(self.question) + estimate_token_count(self.answer)
+
+
 class RetrieveEvent(Event):
     """Event containing retrieved question-answer pairs from the database."""
     
-    qa: list[tuple[str, str]]
+    documents: list[RetrievedDocument]
 
 
 class DeduplicateEvent(Event):
     """Event containing deduplicated question-answer pairs."""
     
-    qa: list[tuple[str, str]]
+    documents: list[RetrievedDocument]
+
+
+class RelevanceVerdict(BaseModel):
+    """Sanity-check decision for one retrieved document."""
+    
+    point_id: int | str
+    score: float | None  # Similarity to the current query, as used by the score gate
+    relevant: bool
+    source: Literal["llm", "cache", "accept_gate", "reject_gate"]
+
+    @classmethod
+    def from_document(
+        cls, document: RetrievedDocument, relevant: bool, source: str
+    ) -> "RelevanceVerdict":
+        """Create the verdict for a retrieved document."""
+        return cls(
+            point_id=document.point_id,
+            score=document.query_score,
+            relevant=relevant,
+            source=source,
+        )
 
 
 class SanityCheckEvent(Event):
     """Event containing question-answer pairs that passed sanity checks."""
     
     qa: list[tuple[str, str]]
+    verdicts: list[RelevanceVerdict] = []  # Recorded in traces for threshold calibration
+    reply: str | None = None  # Speculative reply generated from exactly these pairs
 
 
 class HasQAExamplesEvent(Event):
     """Event containing validated question-answer pairs ready for response generation."""
     
     qa: list[tuple[str, str]]
+    reply: str | None = None  # Already generated reply, see `SanityCheckEvent.reply`
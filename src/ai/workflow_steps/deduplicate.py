@@ -2,18 +2,43 @@
 import logging
 
 # Internal module imports
-from ..workflow_events import DeduplicateEvent, RetrieveEvent
+from src.metrics import metrics
+from src.preprocessing import compute_simhash, hamming_distance
+from src.settings import settings
+from ..workflow_events import DeduplicateEvent, RetrievedDocument, RetrieveEvent
 
 
 # Configure module-level logging
 logger = logging.getLogger(__name__)
 
 
+def is_near_duplicate(signature: str, kept_signatures: list[str], max_distance: int) -> bool:
+    """Check whether a signature is close to any already kept signature.
+    
+    Args:
+        signature: SimHash of the candidate answer
+        kept_signatures: SimHashes of the answers kept so far
+        max_distance: Largest Hamming distance treated as a near-duplicate
+        
+    Returns:
+        True if the candidate should be collapsed
+    """
+    return any(
+        hamming_distance(signature, kept_signature) <= max_distance
+        for kept_signature in kept_signatures
+    )
+
+
 async def deduplicate_step(ev: RetrieveEvent) -> DeduplicateEvent:
     """Execute the deduplication step for the workflow.
     
     This step removes duplicate question-answer pairs based on answer content
     to ensure unique responses and avoid redundancy in the final result.
+    Besides identical answers, near-identical ones (differing in punctuation,
+    greetings or link placeholders) are collapsed using SimHash signatures
+    precomputed at ingestion, keeping the best-ranked document.
+    With answer-grouped retrieval (`QdrantSettings.GROUP_BY_ANSWER`) identical
+    answers are already gone, and the exact check is a safety net.
     
     Args:
         ev: RetrieveEvent containing retrieved question-answer pairs
@@ -21,21 +46,39 @@ async def deduplicate_step(ev: RetrieveEvent) -> DeduplicateEvent:
     Returns:
         DeduplicateEvent containing deduplicated question-answer pairs
     """
-    qa_pairs = ev.qa
-    logger.info(f"Starting deduplication step with {len(qa_pairs)} QA pairs")
+    documents = ev.documents
+    logger.info(f"Starting deduplication step with {len(documents)} QA pairs")
+    
+    collapse_near_duplicates = settings.workflow.COLLAPSE_NEAR_DUPLICATES
+    max_distance = settings.workflow.NEAR_DUPLICATE_MAX_DISTANCE
     
     unique_answers = set()
-    deduplicated_qa_pairs = []
+    kept_signatures = []
+    deduplicated_documents = []
+    near_duplicates: list[RetrievedDocument] = []
     
-    for question, answer in qa_pairs:
-        if answer in unique_answers:
+    for document in documents:
+        if document.answer in unique_answers:
             continue
-        else:
-            unique_answers.add(answer)
-            deduplicated_qa_pairs.append((question, answer))
+        
+        if collapse_near_duplicates:
+            signature = document.answer_signature or compute_simhash(document.answer)
+            if is_near_duplicate(signature, kept_signatures, max_distance):
+                near_duplicates.append(document)
+                continue
+            kept_signatures.append(signature)
+        
+        unique_answers.add(document.answer)
+        deduplicated_documents.append(document)
+    
+    # Every collapsed document is one less document in the LLM prompts
+    tokens_saved = sum(document.prompt_tokens() for document in near_duplicates)
+    metrics.record_value("workflow.deduplicate.near_duplicates", len(near_duplicates))
+    metrics.record_value("workflow.deduplicate.prompt_tokens_saved", tokens_saved)
     
-    duplicates_removed = len(qa_pairs) - len(deduplicated_qa_pairs)
-    logger.info(f"Deduplication completed. Removed {duplicates_removed} duplicates, "
-                f"keeping {len(deduplicated_qa_pairs)} unique QA pairs")
+    duplicates_removed = len(documents) - len(deduplicated_documents)
+    logger.info(f"Deduplication completed. Removed {duplicates_removed} duplicates "
+                f"({len(near_duplicates)} near-duplicates, ~{tokens_saved} prompt tokens saved), "
+                f"keeping {len(deduplicated_documents)} unique QA pairs")
     
-    return DeduplicateEvent(qa=deduplicated_qa_pairs)
+    return DeduplicateEvent(documents=deduplicated_documents)
@@ -0,0 +1,50 @@
+# Standard library imports
+import logging
+
+# External library imports
+from llama_index.core.workflow import Context, StopEvent
+
+# Internal module imports
+from src.ai.retrieval import retrieval_manager
+from src.metrics import metrics
+from src.settings import settings
+from ..workflow_events import PreprocessEvent
+
+
+# Configure module-level logging
+logger = logging.getLogger(__name__)
+
+
+async def exact_match_step(ev: PreprocessEvent, ctx: Context) -> StopEvent | None:
+    """Answer known questions directly from the knowledge base.
+    
+    If the cleaned query equals a normalized knowledge-base question, the
+    stored answer is returned without retrieval and LLM calls, subject to
+    the configured policy (see `WorkflowSettings.EXACT_MATCH_POLICY`).
+    Follow-up messages are never shortcut: a short query like "премия"
+    means something else in the context of the conversation, which only
+    the retrieval and reply steps take into account.
+    
+    Args:
+        ev: PreprocessEvent containing the cleaned query
+        ctx: Context object for sharing data between workflow steps
+        
+    Returns:
+        StopEvent with the stored answer, or None to continue the workflow
+    """
+    policy = settings.workflow.EXACT_MATCH_POLICY
+    if policy == "off":
+        return None
+    
+    if await ctx.get("clear_history"):
+        metrics.increment("workflow.exact_match.skipped_with_history")
+        return None
+    
+    metrics.increment("workflow.exact_match.lookups")
+    answer = retrieval_manager.exact_match_index.lookup(ev.query_clean, policy)
+    if answer is None:
+        return None
+    
+    metrics.increment("workflow.exact_match.shortcuts")
+    logger.info("Query matches a known question exactly - answering from knowledge base")
+    return StopEvent(result=(answer, ev.query_clean))
@@ -1,206 +1,82 @@
 # Standard library imports
+import asyncio
 import logging
-import re
+import os
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
 
 # External library imports
-import pandas as pd
-import pymorphy3
 from llama_index.core.workflow import StartEvent
 
 # Internal module imports
+from src.metrics import metrics
+from src.preprocessing import lemma_cache, preprocess_query_text, seed_lemma_cache_from_csv
+from src.settings import settings
 from ..workflow_events import PreprocessEvent
 
 
 # Configure module-level logging
 logger = logging.getLogger(__name__)
 
-# Initialize morphological analyzer
-morphological_analyzer = pymorphy3.MorphAnalyzer()
+# Apply configured lemma cache bound and optionally warm it up with the
+# knowledge base vocabulary
+lemma_cache.resize(settings.preprocessing.LEMMA_CACHE_SIZE)
 
+if settings.preprocessing.SEED_LEMMA_CACHE:
+    seed_lemma_cache_from_csv(
+        os.path.join(
+            os.path.dirname(__file__), "..", "retrieval", "resources", "qa_df_pairs_db.csv"
+        ),
+        columns=["question_clear", "content_clear"],
+    )
 
-def normalize_whitespace(text: str) -> str:
-    """Remove excessive whitespace and normalize spacing in text.
-    
-    Args:
-        text: Input text to normalize
-        
-    Returns:
-        Text with normalized whitespace
-    """
-    words = text.split()
-    normalized_words = [word.strip() for word in words]
-    return ' '.join(normalized_words)
+metrics.register_gauge("preprocess.lemma_cache", lemma_cache.stats)
 
+# Pool for CPU-bound preprocessing, created on first use
+_preprocess_executor: Executor | None = None
 
-def preprocess_query_text(text: str) -> str:
-    """Preprocess and clean query text for better matching.
-    
-    This function performs comprehensive text preprocessing including:
-    - Greeting and polite words removal
-    - Email, link, and phone number anonymization
-    - Glossary expansion for abbreviations
-    - Morphological analysis for word normalization
-    - Profanity and role-specific terms filtering
+
+def get_preprocess_executor() -> Executor | None:
+    """Return the configured preprocessing pool, creating it if needed.
     
-    Args:
-        text: Raw input text to preprocess
-        
     Returns:
-        Cleaned and processed text ready for retrieval
+        Thread or process pool, or None if preprocessing runs inline
     """
-    logger.info(f"Starting text preprocessing for query: {text[:50]}...")
-    
-    greeting_words = {
-        'здравствуйте', "здравствуй", 'привет', "приветствую", 'добрый', 
-        'день', 'утро', 'вечер', "ночь", "дд"
-    }
-
-    polite_words = {
-        'пожалуйста', 'пож', 'будь', 'добрый', 'спасибо', 'благодарю', 
-        'прошу', "спс", "плиз", "плз"
-    }
-
-    self_intro_words = {
-        'я', 'меня', 'зовут', 'будучи', 'являюсь'
-    }
-
-    quest_words = {
-        "как", "где", "какой"
-    }
-
-    request_verbs = {
-        'хотеть', 'просить', 'помогать', 'надо', 'нужно', 'требовать', 
-        'просьба', 'возможность', "необходимо", "подсказать"
-    }
+    global _preprocess_executor
     
-    roles = {
-        "bp", 'менеджер', 'руководитель', 'работник',
-        'начальник', 'администратор', "должность"
-    }
+    executor_type = settings.preprocessing.EXECUTOR
+    if _preprocess_executor is None and executor_type != "inline":
+        pool_size = settings.preprocessing.POOL_SIZE
+        if executor_type == "process":
+            _preprocess_executor = ProcessPoolExecutor(max_workers=pool_size)
+        else:
+            _preprocess_executor = ThreadPoolExecutor(
+                max_workers=pool_size, thread_name_prefix="preprocess"
+            )
+        logger.info(f"Created {executor_type} pool with {pool_size} workers for preprocessing")
     
-    profanity = {
-        'блять', "бля", "сука", "пиздец", "хуй", "нахуй", "хрен", "нахрен", 
-        "хуйня", "пизда", "ебать", "ебанина", "заебал", "заебало"
-    }
-
-    # Regex patterns for anonymization
-    email_pattern = r'[a-zA-Z0-9_.+-]+@[a-zA-Z0-9-]+\.[a-zA-Z0-9-.]+'
-    link_pattern = r'(https?://[^\s]+|www\.[^\s]+)'
+    return _preprocess_executor
 
-    # Initial text normalization
-    text = text.lower().strip()
-    text = re.sub(email_pattern, 'MAIL', text)
-    text = re.sub(link_pattern, 'LINK', text)
-    text = re.sub(r'\+7 \(xxx\) xxx xx xx', 'PHONE', text)
-    text = re.sub(r'табельный номер \d+', '', text)
-    text = re.sub(r'тн \d+', '', text)
-    text = re.sub(r'№ \d+', '', text)
-    text = normalize_whitespace(text)
 
-    # Glossary for abbreviation expansion
-    glossary_dict = {
-        'лк': 'личный кабинет',
-        'бир': 'беременность и роды',
-        'зп': 'заработная плата',
-        'ндфл': 'налог на доходы физических лиц',
-        'стд': 'срочный трудовой договор',
-        'тк': 'трудовой договор',
-        'ао': 'авансовый отчет',
-        'sla': 'сроки',
-        'эцп': 'электронная цифровая подпись',
-        'кр': 'кадровый резерв',
-        "сфр": "социальный фонд россии",
-        "мчд": "машиночитаемая доверенность",
-        "дк": "директор кластера",
-        "тел": "телефон",
-        "адм": "административный кадровый резерв",
-        "мс": "мастер-система",
-        "орг": "организационная структура",
-        "дмп": "директор магазина по продажам",
-        "комп": "компьютер",
-        "атз": "администратор торгового зала",
-        "дм": "директор магазина",
-        "мп": "мобильное приложение",
-        "уз": "учетная запись",
-        "чаэс": "чернобыльская атомная электростанция",
-        "мкс": "местность, приравненная к районам крайнего севера",
-        "ркс": "район крайнего севера",
-        "нрд": "ненормированный рабочий день",
-        "доп": "дополнительный",
-        "гос": "государственный",
-        "lk": "личный кабинет",
-        "бл": "больничный лист",
-        "ду": "дежурный управляющий",
-        "лтз": "администратор торгового зала",
-        "тех": "технический",
-        "сот": "система оценок труда",
-        "асуз": "автоматизированная система учёта и записи",
-        "скилаз": "система для автоматизации найма и развития талантов",
-        "skillz": "система для автоматизации найма и развития талантов",
-        "скиллаз": "система для автоматизации найма и развития талантов",
-        "skillaz": "система для автоматизации найма и развития талантов",
-        "здм": "заместитель директора магазина",
-        "эп": "электронная подпись",
-        "пк": "персональный консультант",
-        "пб": "платежная база",
-        "сф": "система финансов",
-        "трв": "табель рабочего времени",
-        "есп": "единая система приемки",
-        "рц": "распределительный центр",
-        "бс": "больничный лист",
-        "скд": "система корпоративных документов",
-        "sap": "корпоративная система для управления ресурсами и бизнес-процессами",
-        "сб": "социальная безопасность",
-        "атп": "автотранспортное предприятие",
-        "ур": "удаленная работа",
-        "дс": "дополнительное соглашение",
-        "уд": "удаленный",
-        "укэп": "усиленная квалифицированная электронная подпись",
-        "унэп": "усиленная неквалифицированна электронная подпись",
-        "фл": "физическое лицо",
-        "юл": "юридическое лицо",
-        "sed": "система электронного документооборота",
-        "мед": "медицинский",
-        "дмс": "добровольное медицинское страхование"
-    }
-
-    # Apply glossary expansion
-    for abbreviation, full_form in glossary_dict.items():
-        pattern = r'\b' + re.escape(abbreviation) + r'\b'
-        text = re.sub(pattern, full_form, text, flags=re.IGNORECASE)
-
-    # Tokenize and filter tokens
-    tokens = []
-    for sentence in re.split(r'[.,!?;:()\[\]{}/-]', text.lower()):
-        tokens.extend(sentence.split())
-        
-    tokens_to_remove = []
-    for token in tokens:
-        normalized_word = morphological_analyzer.parse(token)[0].normal_form
-        
-        if (normalized_word in greeting_words or
-            normalized_word in polite_words or
-            normalized_word in self_intro_words or
-            normalized_word in quest_words or
-            normalized_word in request_verbs or
-            normalized_word in profanity or
-            normalized_word in roles):
-            tokens_to_remove.append(token)
-    
-    filtered_tokens = [token for token in tokens if token not in tokens_to_remove]
-    filtered_text = ' '.join(filtered_tokens)
-    filtered_text = re.sub(r'\s+', ' ', filtered_text)
-    
-    processed_text = filtered_text.strip()
-    logger.info(f"Text preprocessing completed. Original length: {len(text)}, "
-                f"Processed length: {len(processed_text)}")
+def shutdown_preprocess_executor():
+    """Shut down the preprocessing pool if it was created."""
+    global _preprocess_executor
     
-    return processed_text
+    if _preprocess_executor is not None:
+        _preprocess_executor.shutdown(wait=False, cancel_futures=True)
+        _preprocess_executor = None
+        logger.info("Preprocessing pool shut down")
 
 
 async def preprocess_step(ev: StartEvent) -> PreprocessEvent:
     """Execute the preprocessing step for the workflow.
     
+    The synchronous regex and stop-word pipeline is dispatched to the
+    configured pool. In a thread pool the pure-Python pipeline still holds
+    the GIL, so the effect on other requests is visible only in the
+    `event_loop.lag_seconds` timing (compare EXECUTOR=inline, thread and
+    process).
+    
     Args:
         ev: StartEvent containing the original user query
         
@@ -210,7 +86,17 @@ async def preprocess_step(ev: StartEvent) -> PreprocessEvent:
     query = ev.query
     logger.info(f"Starting preprocessing step for query: {query[:50]}...")
     
-    query_clean = preprocess_query_text(query)
+    executor = get_preprocess_executor()
+    started_at = time.perf_counter()
+    
+    if executor is None:
+        query_clean = preprocess_query_text(query)
+    else:
+        query_clean = await asyncio.get_running_loop().run_in_executor(
+            executor, preprocess_query_text, query
+        )
+    
+    metrics.observe("preprocess.duration_seconds", time.perf_counter() - started_at)
     
     logger.info("Preprocessing step completed successfully")
     return PreprocessEvent(query_clean=query_clean)
@@ -43,4 +43,4 @@ async def is_there_qa_examples_step(
         return StopEvent(result=(error_message, query_clean))
     else:
         logger.info(f"Found {len(qa_pairs)} valid QA examples - proceeding to response generation")
-        return HasQAExamplesEvent(qa=qa_pairs)
+        return HasQAExamplesEvent(qa=qa_pairs, reply=ev.reply)
@@ -7,32 +7,93 @@ from qdrant_client.http.models import ScoredPoint
 
 # Internal module imports
 from src.ai.retrieval import retrieval_manager
-from ..workflow_events import PreprocessEvent, RetrieveEvent
+from src.ai.retrieval.fusion import recency_weights
+from src.ai.retrieval.ingestion import ANSWER_SIGNATURE_FIELD, TOKEN_COUNT_FIELD
+from src.metrics import metrics
+from src.settings import settings
+from ..workflow_events import PreprocessEvent, RetrievedDocument, RetrieveEvent
 
 
 # Configure module-level logging
 logger = logging.getLogger(__name__)
 
 
-def process_scored_points(points: list[ScoredPoint]) -> list[tuple[str, str]]:
-    """Process Qdrant scored points into question-answer tuples.
+def process_scored_points(
+    points: list[ScoredPoint], query_scores: list[float | None] | None = None
+) -> list[RetrievedDocument]:
+    """Process Qdrant scored points into retrieved documents.
     
     Args:
         points: List of scored points from Qdrant search
+        query_scores: Similarity of each point to the current query, if the
+            points were not retrieved by the current query alone
         
     Returns:
-        List of tuples containing (question, answer) pairs
+        List of retrieved question-answer documents
     """
-    qa_tuples = [
-        (point.payload["question_clear"], point.payload["content_clear"])
-        for point in points
+    if query_scores is None:
+        query_scores = [point.score for point in points]
+    
+    documents = [
+        RetrievedDocument(
+            question=point.payload["question_clear"],
+            answer=point.payload["content_clear"],
+            score=point.score,
+            query_score=query_score,
+            point_id=point.id,
+            answer_signature=point.payload.get(ANSWER_SIGNATURE_FIELD),
+            token_count=point.payload.get(TOKEN_COUNT_FIELD),
+        )
+        for point, query_score in zip(points, query_scores)
+    ]
+    
+    logger.info(f"Processed {len(documents)} question-answer pairs from search results")
+    return documents
+
+
+def apply_adaptive_cutoff(
+    documents: list[RetrievedDocument], score_floor: float, max_gap: float
+) -> list[RetrievedDocument]:
+    """Drop documents scored clearly below the query's best match.
+    
+    A document is kept if its similarity to the current query is at least
+    `score_floor` and within `max_gap` of the best such similarity, so
+    irrelevant tail documents never reach the sanity-check prompt. Scores
+    against earlier messages are not used for the gap: a strong match to
+    an old turn must not push out the matches of the current question.
+    Documents found only through earlier messages are kept if their score
+    reaches `score_floor`.
+    
+    Args:
+        documents: Retrieved documents
+        score_floor: Absolute minimum similarity score
+        max_gap: Maximum distance from the best score
+        
+    Returns:
+        Documents that passed the cutoff, in their original order
+    """
+    if not documents:
+        return documents
+    
+    query_scores = [
+        document.query_score for document in documents if document.query_score is not None
     ]
+    best_score = max(query_scores, default=score_floor)
+    threshold = max(score_floor, best_score - max_gap)
+    kept_documents = []
+    for document in documents:
+        if document.query_score is None:
+            if document.score >= score_floor:
+                kept_documents.append(document)
+        elif document.query_score >= threshold:
+            kept_documents.append(document)
     
-    logger.info(f"Processed {len(qa_tuples)} question-answer pairs from search results")
-    return qa_tuples
+    logger.info(f"Adaptive cutoff at {threshold:.3f} (best query score {best_score:.3f}) kept "
+                f"{len(kept_documents)} of {len(documents)} documents")
+    return kept_documents
 
 
-def retrieve_similar_qa_pairs(query_clean: str) -> list[tuple[str, str]]:
+async def retrieve_similar_qa_pairs(query_clean: str) -> list[RetrievedDocument]:
     """Retrieve similar question-answer pairs from the knowledge base.
     
     Args:
@@ -43,19 +104,41 @@ def retrieve_similar_qa_pairs(query_clean: str) -> list[tuple[str, str]]:
     """
     logger.info(f"Retrieving similar QA pairs for query: {query_clean[:50]}...")
     
-    points = retrieval_manager.retrieve(query_clean)
+    points = await retrieval_manager.retrieve(query_clean)
     search_results = process_scored_points(points)
     
     logger.info(f"Retrieved {len(search_results)} similar QA pairs")
     return search_results
 
 
+async def retrieve_fused_qa_pairs(queries: list[str]) -> list[RetrievedDocument]:
+    """Retrieve QA pairs for the current query and earlier user messages.
+    
+    Args:
+        queries: Current query followed by earlier user messages, newest first
+        
+    Returns:
+        List of similar question-answer pairs from the fused rankings
+    """
+    weights = recency_weights(len(queries), settings.workflow.HISTORY_WEIGHT_DECAY)
+    fused_points = await retrieval_manager.retrieve_fused(queries, weights)
+    search_results = process_scored_points(
+        [point for point, _ in fused_points],
+        query_scores=[query_score for _, query_score in fused_points],
+    )
+    
+    logger.info(f"Retrieved {len(search_results)} similar QA pairs")
+    return search_results
+
+
 async def retrieve_step(ev: PreprocessEvent, ctx: Context) -> RetrieveEvent:
     """Execute the retrieval step for the workflow.
     
     This step retrieves relevant question-answer pairs from the knowledge base
     based on the preprocessed query. It also considers conversation history
-    to provide better context for retrieval.
+    to provide better context for retrieval: by default the query and recent
+    user messages are searched separately in one batch and the rankings are
+    fused with recency weights (see `WorkflowSettings.HISTORY_RETRIEVAL`).
     
     Args:
         ev: PreprocessEvent containing the cleaned query
@@ -72,24 +155,36 @@ async def retrieve_step(ev: PreprocessEvent, ctx: Context) -> RetrieveEvent:
     # Get conversation history from context
     clear_history = await ctx.get("clear_history")
     
-    if clear_history:
-        # Get last 2 user messages from conversation history
+    history_queries = settings.workflow.HISTORY_QUERIES
+    last_user_messages = []
+    if clear_history and history_queries > 0:
         last_user_messages = [
             msg for msg in clear_history if msg["role"] == "user"
-        ][-2:]
-        
+        ][-history_queries:]
+    message_contents = [msg["content"] for msg in last_user_messages]
+    
+    if not message_contents:
+        logger.info("No conversation history available, using current query only")
+        qa_pairs = await retrieve_similar_qa_pairs(query_clean)
+    elif settings.workflow.HISTORY_RETRIEVAL == "concat":
         # Concatenate historical messages with current query for better context
-        message_contents = [msg["content"] for msg in last_user_messages]
         concatenated_query = "\n".join(message_contents + [query_clean])
-        
         logger.info(f"Using contextual query with {len(last_user_messages)} "
                    f"previous messages for retrieval")
+        qa_pairs = await retrieve_similar_qa_pairs(concatenated_query)
     else:
-        concatenated_query = query_clean
-        logger.info("No conversation history available, using current query only")
+        # Newest first, repeated messages searched once
+        queries = list(dict.fromkeys([query_clean] + message_contents[::-1]))
+        logger.info(f"Fusing retrieval for current query and {len(queries) - 1} "
+                    f"previous messages")
+        qa_pairs = await retrieve_fused_qa_pairs(queries)
     
-    # Retrieve similar question-answer pairs
-    qa_pairs = retrieve_similar_qa_pairs(concatenated_query)
+    documents = apply_adaptive_cutoff(
+        qa_pairs,
+        score_floor=settings.workflow.SCORE_FLOOR,
+        max_gap=settings.workflow.SCORE_MAX_GAP,
+    )
+    metrics.record_value("workflow.retrieve.cutoff_dropped", len(qa_pairs) - len(documents))
     
-    logger.info(f"Retrieval step completed with {len(qa_pairs)} results")
-    return RetrieveEvent(qa=qa_pairs)
+    logger.info(f"Retrieval step completed with {len(documents)} results")
+    return RetrieveEvent(documents=documents)
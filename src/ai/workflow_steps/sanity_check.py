@@ -1,26 +1,87 @@
 # Standard library imports
 import asyncio
+import hashlib
 import json
 import logging
 
 # External library imports
-import openai
 from llama_index.core.workflow import Context
 
 # Internal module imports
+from src.caching import LRUCache
+from src.metrics import metrics
+from src.preprocessing import normalize_whitespace
 from src.settings import settings
-from ..workflow_events import DeduplicateEvent, SanityCheckEvent
+from ..llm_clients import llm_clients
+from ..prompts import get_prompt_template
+from ..workflow_events import (
+    DeduplicateEvent,
+    RelevanceVerdict,
+    RetrievedDocument,
+    SanityCheckEvent,
+)
 
 
 # Configure module-level logging
 logger = logging.getLogger(__name__)
 
+# Relevance verdicts of the LLM for (query, context, document) triples
+relevance_cache = LRUCache(
+    maxsize=settings.sanity_check.CACHE_SIZE,
+    ttl_seconds=settings.sanity_check.CACHE_TTL_SECONDS,
+)
+metrics.register_gauge("sanity_check.relevance_cache", relevance_cache.stats)
+
+# Tokens of the "Документ N / Вопрос / Ответ" framing added per document
+DOCUMENT_OVERHEAD_TOKENS = 10
+
+
+def pack_batches(
+    documents: list[RetrievedDocument], token_budget: int, max_batch_size: int
+) -> list[list[int]]:
+    """Greedily pack documents into batches by estimated prompt tokens.
+    
+    Documents keep their order; a batch is closed once the next document
+    would exceed the token budget or the batch holds `max_batch_size`
+    documents. A document larger than the whole budget gets its own batch.
+    
+    Args:
+        documents: Documents to judge
+        token_budget: Maximum estimated document tokens per batch
+        max_batch_size: Maximum number of documents per batch
+        
+    Returns:
+        Batches of indices into `documents`
+    """
+    batches = []
+    current_batch = []
+    current_tokens = 0
+    for idx, document in enumerate(documents):
+        tokens = document.prompt_tokens() + DOCUMENT_OVERHEAD_TOKENS
+        if current_batch and (
+            current_tokens + tokens > token_budget or len(current_batch) >= max_batch_size
+        ):
+            batches.append(current_batch)
+            current_batch = []
+            current_tokens = 0
+        current_batch.append(idx)
+        current_tokens += tokens
+    
+    if current_batch:
+        batches.append(current_batch)
+    
+    return batches
+
 
 async def process_qa_batch(
     llm_client, query_clean: str, qa_batch: list[tuple[str, str]], 
     previous_user_messages: list[dict]
-) -> list[tuple[str, str]]:
-    """Process a single batch of QA pairs and return the relevant ones.
+) -> tuple[list[bool], bool]:
+    """Process a single batch of QA pairs and judge their relevance.
+    
+    If the LLM returns a wrong number of scores, missing verdicts are
+    filled in as irrelevant and extra ones dropped, and the batch is
+    reported as unreliable so its verdicts are not cached.
     
     Args:
         llm_client: OpenAI client for LLM API calls
@@ -29,79 +90,18 @@ async def process_qa_batch(
         previous_user_messages: Previous user messages for context
         
     Returns:
-        List of relevant question-answer pairs
+        Relevance verdict for each pair of the batch and whether the LLM
+        returned exactly one score per pair
     """
     logger.info(f"Processing batch of {len(qa_batch)} QA pairs for relevance")
     
-    # System prompt for grounded responses
-    system_prompt = (
-        "Твоя задача - определить, релевантны ли предоставленные документы запросу пользователя. "
-        "Релевантым считай тот документ, в котором тема хотя бы смежно связана с запросом. "
-        "Верни ровно один массив из строк '0' или '1', где '1' означает, что документ релевантен запросу, "
-        "а '0' - что нерелевантен. Массив должен иметь ровно столько элементов, сколько документов в запросе."
-    )
-
     # Extract message contents for context
     previous_messages_text = ", ".join([msg['content'] for msg in previous_user_messages])
-
-    # Build messages based on model type
-    if settings.llm.MODEL_NAME == "VikhrMODEL_NAMEs/Vikhr-Nemo-12B-Instruct-R-21-09-24":
-        # Format QA pairs as documents for Vikhr model
-        documents = []
-        for idx, (question, answer) in enumerate(qa_batch):
-            documents.append({"doc_id": idx, "title": question, "content": answer})
-
-        user_content = (
-            f"Прошлые сообщения пользователя: '{previous_messages_text}'. "
-            f"Запрос пользователя: '{query_clean}'. "
-            f"Оцени релевантность каждого документа к этому запросу с учетом контекста "
-            f"и верни массив из {len(qa_batch)} элементов, где каждый элемент - '0' или '1'."
-        )
-
-        messages = [
-            {"role": "system", "content": system_prompt},
-            {"role": "documents", "content": json.dumps(documents, ensure_ascii=False)},
-            {"role": "user", "content": user_content}
-        ]
     
-    elif settings.llm.MODEL_NAME == "google/gemma-2-9b-it":
-        # Format for Google Gemma model
-        documents_text = ""
-        for idx, (question, answer) in enumerate(qa_batch):
-            documents_text += f"Документ {idx}:\nВопрос: {question}\nОтвет: {answer}\n\n"
-
-        user_content = (
-            f"{system_prompt}\n\n"
-            f"Документы:\n{documents_text}\n\n"
-            f"Прошлые сообщения пользователя: '{previous_messages_text}'. "
-            f"Запрос пользователя: '{query_clean}'. "
-            f"Оцени релевантность каждого документа к этому запросу с учетом контекста "
-            f"и верни массив из {len(qa_batch)} элементов, где каждый элемент - '0' или '1'."
-        )
-
-        messages = [
-            {"role": "user", "content": user_content}
-        ]
-
-    else:
-        # Default format for other models
-        documents_text = ""
-        for idx, (question, answer) in enumerate(qa_batch):
-            documents_text += f"Документ {idx}:\nВопрос: {question}\nОтвет: {answer}\n\n"
-
-        user_content = (
-            f"Документы:\n{documents_text}\n\n"
-            f"Прошлые сообщения пользователя: '{previous_messages_text}'. "
-            f"Запрос пользователя: '{query_clean}'. "
-            f"Оцени релевантность каждого документа к этому запросу с учетом контекста "
-            f"и верни массив из {len(qa_batch)} элементов, где каждый элемент - '0' или '1'."
-        )
-
-        messages = [
-            {"role": "system", "content": system_prompt},
-            {"role": "user", "content": user_content}
-        ]
-
+    messages = get_prompt_template("sanity_check").render(
+        qa_batch, previous_messages=previous_messages_text, query=query_clean
+    )
+    
     # Call the LLM API with guided JSON output
     response = await llm_client.chat.completions.create(
         model=settings.llm.MODEL_NAME,
@@ -123,7 +123,9 @@ async def process_qa_batch(
     logger.info(f"Parsed relevance scores: {scores}")
 
     # Ensure the length matches the batch size
-    if len(scores) != len(qa_batch):
+    matches_batch = len(scores) == len(qa_batch)
+    if not matches_batch:
+        metrics.increment("sanity_check.length_mismatch")
         if len(scores) < len(qa_batch):
             # If too short, extend with zeros
             scores.extend([0] * (len(qa_batch) - len(scores)))
@@ -133,61 +135,158 @@ async def process_qa_batch(
         
         logger.warning(f"Adjusted scores length from {len(json.loads(response_text))} to {len(scores)}")
 
-    # Filter QA pairs based on relevance scores
-    filtered_qa_pairs = []
-    for (question, answer), score in zip(qa_batch, scores):
-        if score == 1:
-            filtered_qa_pairs.append((question, answer))
+    verdicts = [score == 1 for score in scores]
 
-    relevant_count = len(filtered_qa_pairs)
+    relevant_count = sum(verdicts)
     logger.info(f"Found {relevant_count} relevant QA pairs out of {len(qa_batch)} in batch")
     
-    return filtered_qa_pairs
+    return verdicts, matches_batch
+
+
+def compute_context_hash(previous_user_messages: list[dict]) -> str:
+    """Hash everything besides the query and document that affects a verdict.
+    
+    Args:
+        previous_user_messages: Previous user messages included in the prompt
+        
+    Returns:
+        Hex digest of the judging model and the conversation context
+    """
+    context = "\x1f".join(
+        [settings.llm.MODEL_NAME] + [msg["content"] for msg in previous_user_messages]
+    )
+    return hashlib.sha256(context.encode("utf-8")).hexdigest()
+
+
+def get_previous_user_messages(clear_history: list[dict] | None) -> list[dict]:
+    """Return the user messages of the history that give the query context.
+    
+    Args:
+        clear_history: Cleaned conversation history, if any
+        
+    Returns:
+        Last 2 user messages
+    """
+    if not clear_history:
+        return []
+    return [msg for msg in clear_history if msg["role"] == "user"][-2:]
+
+
+def gate_by_score(score: float | None) -> bool | None:
+    """Decide relevance from the retrieval score alone when it is unambiguous.
+    
+    Only the similarity to the current query counts: a document that
+    matched an earlier message well says nothing about the new question.
+    
+    Args:
+        score: Similarity of the document to the current query, None if
+            only earlier messages retrieved it
+        
+    Returns:
+        True above `SanityCheckSettings.ACCEPT_SCORE`, False below
+        `SanityCheckSettings.REJECT_SCORE`, None if the LLM has to judge
+    """
+    if score is None:
+        return None
+    if score >= settings.sanity_check.ACCEPT_SCORE:
+        return True
+    if score < settings.sanity_check.REJECT_SCORE:
+        return False
+    return None
 
 
 async def perform_sanity_check(
-    query_clean: str, qa_pairs: list[tuple[str, str]], previous_user_messages: list[dict]
-) -> list[tuple[str, str]]:
+    query_clean: str, documents: list[RetrievedDocument], previous_user_messages: list[dict]
+) -> list[RelevanceVerdict]:
     """Perform sanity check on question-answer pairs for relevance.
     
+    Documents clearly similar or dissimilar to the current query are decided by
+    `gate_by_score` without the LLM. For the ambiguous rest, verdicts are
+    cached per (normalized query, context hash, point id); only documents
+    without a cached verdict are sent to the LLM, packed into batches by
+    `pack_batches`, and no LLM call is made if every verdict is known.
+    
     Args:
         query_clean: Cleaned user query
-        qa_pairs: List of question-answer pairs to check
+        documents: Retrieved documents to check
         previous_user_messages: Previous user messages for context
         
     Returns:
-        List of relevant question-answer pairs
+        Relevance verdict for each document, in retrieval order
     """
-    logger.info(f"Starting sanity check for {len(qa_pairs)} QA pairs")
+    logger.info(f"Starting sanity check for {len(documents)} QA pairs")
     
-    # Initialize LLM client
-    llm_client = openai.AsyncOpenAI(
-        base_url=settings.llm.API_BASE_URL,
-        api_key=settings.llm.API_KEY,
-    )
-
-    # Process QA pairs in batches for efficiency
-    batch_size = 10
-    batches = [
-        qa_pairs[i:i + batch_size] for i in range(0, len(qa_pairs), batch_size)
-    ]
+    normalized_query = normalize_whitespace(query_clean.lower())
+    context_hash = compute_context_hash(previous_user_messages)
     
-    logger.info(f"Processing {len(batches)} batches of QA pairs")
+    verdicts: list[RelevanceVerdict | None] = []
+    cache_keys = {}
+    for idx, document in enumerate(documents):
+        gate_verdict = gate_by_score(document.query_score)
+        if gate_verdict is not None:
+            source = "accept_gate" if gate_verdict else "reject_gate"
+            metrics.increment(f"sanity_check.{source}")
+            verdicts.append(RelevanceVerdict.from_document(document, gate_verdict, source))
+            continue
+        
+        cache_keys[idx] = (normalized_query, context_hash, document.point_id)
+        cached_verdict = relevance_cache.get(cache_keys[idx])
+        if cached_verdict is not None:
+            verdicts.append(RelevanceVerdict.from_document(document, cached_verdict, "cache"))
+        else:
+            verdicts.append(None)
+    
+    uncached_indices = [idx for idx, verdict in enumerate(verdicts) if verdict is None]
+    metrics.increment("sanity_check.llm_judged", len(uncached_indices))
+    
+    logger.info(f"Relevance decided without LLM for {len(documents) - len(uncached_indices)} "
+                f"of {len(documents)} QA pairs")
+    
+    if uncached_indices:
+        # Shared pooled LLM client
+        llm_client = llm_clients.get()
 
-    # Process all batches concurrently
-    tasks = [
-        process_qa_batch(llm_client, query_clean, batch, previous_user_messages) 
-        for batch in batches
-    ]
-    batch_results = await asyncio.gather(*tasks)
+        # Pack QA pairs into batches that fit the prompt token budget
+        uncached_documents = [documents[idx] for idx in uncached_indices]
+        packed_batches = pack_batches(
+            uncached_documents,
+            token_budget=settings.sanity_check.BATCH_TOKEN_BUDGET,
+            max_batch_size=settings.sanity_check.MAX_BATCH_SIZE,
+        )
+        batches = [
+            [
+                (uncached_documents[i].question, uncached_documents[i].answer)
+                for i in batch_indices
+            ]
+            for batch_indices in packed_batches
+        ]
+        metrics.record_value("sanity_check.batches_per_request", len(batches))
+        
+        logger.info(f"Processing {len(batches)} batches of QA pairs")
 
-    # Flatten results from all batches
-    filtered_qa_pairs = [item for sublist in batch_results for item in sublist]
-    
-    logger.info(f"Sanity check completed. {len(filtered_qa_pairs)} relevant QA pairs "
-                f"out of {len(qa_pairs)} total pairs")
+        # Process all batches concurrently
+        tasks = [
+            process_qa_batch(llm_client, query_clean, batch, previous_user_messages) 
+            for batch in batches
+        ]
+        batch_results = await asyncio.gather(*tasks)
+
+        # Map results back to documents; remember only well-formed batches
+        for batch_indices, (batch_verdicts, matches_batch) in zip(packed_batches, batch_results):
+            for i, verdict in zip(batch_indices, batch_verdicts):
+                idx = uncached_indices[i]
+                verdicts[idx] = RelevanceVerdict.from_document(documents[idx], verdict, "llm")
+                if matches_batch:
+                    relevance_cache.set(cache_keys[idx], verdict)
+    elif documents:
+        metrics.increment("sanity_check.llm_calls_skipped")
+        logger.info("All relevance verdicts known - skipping LLM call")
+
+    relevant_count = sum(verdict.relevant for verdict in verdicts)
+    logger.info(f"Sanity check completed. {relevant_count} relevant QA pairs "
+                f"out of {len(documents)} total pairs")
     
-    return filtered_qa_pairs
+    return verdicts
 
 
 async def sanity_check_step(ev: DeduplicateEvent, ctx: Context) -> SanityCheckEvent:
@@ -201,9 +300,10 @@ async def sanity_check_step(ev: DeduplicateEvent, ctx: Context) -> SanityCheckEv
         ctx: Context object for sharing data between workflow steps
         
     Returns:
-        SanityCheckEvent containing relevance-filtered QA pairs
+        SanityCheckEvent containing relevance-filtered QA pairs and the
+        verdict for every checked document
     """
-    qa_pairs = ev.qa
+    documents = ev.documents
     query_clean = await ctx.get("query_clean")
     
     logger.info("Starting sanity check step")
@@ -212,12 +312,14 @@ async def sanity_check_step(ev: DeduplicateEvent, ctx: Context) -> SanityCheckEv
     clear_history = await ctx.get("clear_history")
     
     # Extract last 2 user messages for context
-    previous_user_messages = [
-        msg for msg in clear_history if msg["role"] == "user"
-    ][-2:] if clear_history else []
+    previous_user_messages = get_previous_user_messages(clear_history)
     
     # Perform relevance filtering
-    relevant_qa_pairs = await perform_sanity_check(query_clean, qa_pairs, previous_user_messages)
+    verdicts = await perform_sanity_check(query_clean, documents, previous_user_messages)
+    relevant_qa_pairs = [
+        (document.question, document.answer)
+        for document, verdict in zip(documents, verdicts) if verdict.relevant
+    ]
     
     logger.info("Sanity check step completed successfully")
-    return SanityCheckEvent(qa=relevant_qa_pairs)
+    return SanityCheckEvent(qa=relevant_qa_pairs, verdicts=verdicts)
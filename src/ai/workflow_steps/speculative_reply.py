@@ -0,0 +1,156 @@
+# Standard library imports
+import asyncio
+import logging
+import threading
+import time
+
+# External library imports
+from llama_index.core.workflow import Context
+
+# Internal module imports
+from src.metrics import metrics
+from ..workflow_events import DeduplicateEvent, RetrievedDocument, SanityCheckEvent
+from .reply import generate_llm_response
+from .sanity_check import gate_by_score, get_previous_user_messages, perform_sanity_check
+
+
+# Configure module-level logging
+logger = logging.getLogger(__name__)
+
+
+class SpeculationStats:
+    """Thread-safe hit/miss counters of speculative replies."""
+
+    def __init__(self):
+        """Initialize zeroed counters."""
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def record(self, hit: bool):
+        """Count one speculation outcome.
+        
+        Args:
+            hit: Whether the speculative reply was kept
+        """
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def stats(self) -> dict:
+        """Return hit/miss statistics of the speculation.
+        
+        Returns:
+            Dictionary with hits, misses and hit_ratio
+        """
+        attempts = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / attempts if attempts else 0.0,
+        }
+
+
+speculation_stats = SpeculationStats()
+metrics.register_gauge("workflow.speculative_reply", speculation_stats.stats)
+
+
+def predict_relevant_documents(documents: list[RetrievedDocument]) -> list[RetrievedDocument]:
+    """Guess which documents the sanity check will keep.
+    
+    Documents rejected by the score gate are known to be dropped; every
+    other document is assumed relevant.
+    
+    Args:
+        documents: Deduplicated retrieved documents
+    
+    Returns:
+        Documents expected to pass the sanity check, in retrieval order
+    """
+    return [document for document in documents if gate_by_score(document.query_score) is not False]
+
+
+async def timed_llm_response(
+    query_clean: str, qa_examples: list[tuple[str, str]], conversation_history: list[dict]
+) -> tuple[str, float]:
+    """Generate a reply and measure how long the LLM call took.
+    
+    Args:
+        query_clean: Cleaned user query
+        qa_examples: Question-answer examples for the prompt
+        conversation_history: Previous conversation messages
+    
+    Returns:
+        Generated reply and its duration in seconds
+    """
+    started_at = time.perf_counter()
+    reply = await generate_llm_response(query_clean, qa_examples, conversation_history)
+    return reply, time.perf_counter() - started_at
+
+
+async def speculative_sanity_check_step(ev: DeduplicateEvent, ctx: Context) -> SanityCheckEvent:
+    """Run the sanity check with the reply generated speculatively in parallel.
+    
+    The reply is started on the documents `predict_relevant_documents`
+    expects to pass. If the sanity check keeps exactly these documents, the
+    reply is handed on in the event and the reply step skips its LLM call;
+    otherwise it is cancelled and the reply step generates it as usual.
+    Outcomes are reported in the `workflow.speculative_reply` gauge and the
+    time gained on hits as `workflow.speculative_reply.latency_saved_seconds`.
+    
+    Args:
+        ev: DeduplicateEvent containing deduplicated QA pairs
+        ctx: Context object for sharing data between workflow steps
+    
+    Returns:
+        SanityCheckEvent with relevance-filtered QA pairs, the verdicts and
+        the speculative reply on a hit
+    """
+    documents = ev.documents
+    query_clean = await ctx.get("query_clean")
+    clear_history = await ctx.get("clear_history")
+    previous_user_messages = get_previous_user_messages(clear_history)
+    
+    speculative_qa_pairs = [
+        (document.question, document.answer)
+        for document in predict_relevant_documents(documents)
+    ]
+    
+    reply_task = None
+    if speculative_qa_pairs:
+        reply_task = asyncio.create_task(
+            timed_llm_response(query_clean, speculative_qa_pairs, clear_history)
+        )
+        logger.info(f"Started speculative reply on {len(speculative_qa_pairs)} QA pairs")
+    
+    started_at = time.perf_counter()
+    try:
+        verdicts = await perform_sanity_check(query_clean, documents, previous_user_messages)
+    except BaseException:
+        if reply_task is not None:
+            reply_task.cancel()
+        raise
+    check_duration = time.perf_counter() - started_at
+    
+    relevant_qa_pairs = [
+        (document.question, document.answer)
+        for document, verdict in zip(documents, verdicts) if verdict.relevant
+    ]
+    
+    reply = None
+    if reply_task is not None:
+        hit = relevant_qa_pairs == speculative_qa_pairs
+        speculation_stats.record(hit)
+        if hit:
+            reply, reply_duration = await reply_task
+            latency_saved = check_duration + reply_duration - (time.perf_counter() - started_at)
+            metrics.observe("workflow.speculative_reply.latency_saved_seconds", latency_saved)
+            logger.info(f"Speculative reply kept, saved {latency_saved:.2f}s")
+        else:
+            reply_task.cancel()
+            logger.info(f"Speculative reply discarded: {len(relevant_qa_pairs)} of "
+                        f"{len(speculative_qa_pairs)} predicted QA pairs are relevant")
+    
+    return SanityCheckEvent(qa=relevant_qa_pairs, verdicts=verdicts, reply=reply)
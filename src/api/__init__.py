@@ -1,12 +1,19 @@
 # Standard library imports
+import asyncio
 import logging
+from contextlib import asynccontextmanager
 
 # External library imports
 from fastapi import FastAPI, HTTPException
+from fastapi.responses import JSONResponse
 from langfuse import Langfuse
 
 # Internal module imports
 from src.ai import run_workflow_with_tracing
+from src.ai.llm_clients import llm_clients
+from src.ai.retrieval import retrieval_manager
+from src.ai.workflow_steps.preprocess import shutdown_preprocess_executor
+from src.metrics import metrics, monitor_event_loop_lag
 from src.settings import settings
 from .models import ChatRequest, ChatResponse, ScoreRequest, ScoreResponse
 
@@ -26,11 +33,37 @@ langfuse_client.create_dataset("qa")
 logger.info("Langfuse client initialized and dataset 'qa' created")
 
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Manage resources that live as long as the application.
+    
+    Retrieval initialization (knowledge base sync and index loading) runs
+    in the background, so the server binds its port right away and reports
+    progress through the readiness probe.
+    
+    Args:
+        app: FastAPI application instance
+    """
+    llm_clients.start()
+    retrieval_init_task = asyncio.create_task(retrieval_manager.initialize())
+    loop_lag_task = asyncio.create_task(monitor_event_loop_lag())
+    
+    yield
+    
+    logger.info("Releasing application resources")
+    retrieval_init_task.cancel()
+    loop_lag_task.cancel()
+    await llm_clients.aclose()
+    shutdown_preprocess_executor()
+    await retrieval_manager.aclose()
+
+
 # Create FastAPI application instance
 api_app = FastAPI(
     title="X5 Technical Support API",
     description="API for X5 technical support automation",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan,
 )
 
 logger.info("FastAPI application initialized")
@@ -51,8 +84,9 @@ async def get_api_root():
 
 
 @api_app.get("/health")
+@api_app.get("/health/live")
 async def perform_health_check():
-    """Health check endpoint for service monitoring.
+    """Liveness probe: the process is up and serving HTTP.
     
     Returns:
         Health status information for monitoring systems
@@ -64,6 +98,35 @@ async def perform_health_check():
     }
 
 
+@api_app.get("/health/ready")
+async def perform_readiness_check():
+    """Readiness probe: the search index is loaded and chat requests can be served.
+    
+    Returns:
+        Retrieval state, with status code 503 while no index is available
+    """
+    readiness = {
+        "status": retrieval_manager.state,
+        "message": retrieval_manager.state_detail,
+    }
+    if not retrieval_manager.is_serving:
+        return JSONResponse(status_code=503, content=readiness)
+    return readiness
+
+
+@api_app.get("/metrics")
+async def get_metrics():
+    """Expose in-process performance metrics.
+    
+    Returns:
+        Snapshot of counters, timings and gauges, including the prefix
+        cache statistics of the LLM server
+    """
+    snapshot = metrics.snapshot()
+    snapshot["gauges"]["llm.prefix_cache"] = await llm_clients.fetch_prefix_cache_stats()
+    return snapshot
+
+
 @api_app.post("/chat", response_model=ChatResponse)
 async def process_chat_message(request: ChatRequest):
     """Process chat message and return AI-generated response.
@@ -78,8 +141,17 @@ async def process_chat_message(request: ChatRequest):
         ChatResponse with AI-generated response and updated conversation history
         
     Raises:
-        HTTPException: If processing fails due to internal errors
+        HTTPException: 503 while the search index is not loaded yet, 500 if
+            processing fails due to internal errors
     """
+    if not retrieval_manager.is_serving:
+        metrics.increment("api.chat.rejected_not_ready")
+        raise HTTPException(
+            status_code=503,
+            detail=f"Service is {retrieval_manager.state}, search index is not loaded yet",
+            headers={"Retry-After": str(int(settings.qdrant.INIT_RETRY_SECONDS))},
+        )
+    
     try:
         logger.info(f"Processing chat request: {request.message[:50]}...")
         
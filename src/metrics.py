@@ -0,0 +1,131 @@
+# Standard library imports
+import asyncio
+import logging
+import threading
+from typing import Callable
+
+
+# Configure module-level logging
+logger = logging.getLogger(__name__)
+
+
+class MetricsRegistry:
+    """Process-wide registry of counters, timings and gauges.
+    
+    Counters are monotonically increasing numbers, timings keep count, sum
+    and max of observed durations, values do the same for per-request
+    quantities that are not durations (document, batch or token counts),
+    and gauges are callables evaluated when a snapshot is taken (e.g. cache
+    statistics).
+    """
+
+    def __init__(self):
+        """Initialize an empty registry."""
+        self._counters: dict[str, float] = {}
+        self._timings: dict[str, dict[str, float]] = {}
+        self._values: dict[str, dict[str, float]] = {}
+        self._gauges: dict[str, Callable[[], object]] = {}
+        self._lock = threading.Lock()
+
+    def increment(self, name: str, value: float = 1):
+        """Increase the counter by the given value.
+        
+        Args:
+            name: Counter name
+            value: Increment
+        """
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + value
+
+    def observe(self, name: str, seconds: float):
+        """Record a duration for the timing.
+        
+        Args:
+            name: Timing name
+            seconds: Observed duration in seconds
+        """
+        with self._lock:
+            self._aggregate(self._timings, name, seconds)
+
+    def record_value(self, name: str, value: float):
+        """Record a per-request quantity that is not a duration.
+        
+        Args:
+            name: Value name
+            value: Observed quantity (e.g. number of documents)
+        """
+        with self._lock:
+            self._aggregate(self._values, name, value)
+
+    @staticmethod
+    def _aggregate(distributions: dict[str, dict[str, float]], name: str, value: float):
+        """Add an observation to the count, sum and max of a distribution."""
+        distribution = distributions.setdefault(name, {"count": 0, "sum": 0.0, "max": 0.0})
+        distribution["count"] += 1
+        distribution["sum"] += value
+        distribution["max"] = max(distribution["max"], value)
+
+    def register_gauge(self, name: str, callback: Callable[[], object]):
+        """Register a callable whose value is reported in snapshots.
+        
+        Args:
+            name: Gauge name
+            callback: Function returning the current value
+        """
+        with self._lock:
+            self._gauges[name] = callback
+
+    def snapshot(self) -> dict:
+        """Return the current values of all metrics.
+        
+        Returns:
+            Dictionary with counters, timings and values (with mean) and gauges
+        """
+        with self._lock:
+            counters = dict(self._counters)
+            timings = {
+                name: {**timing, "mean": timing["sum"] / timing["count"]}
+                for name, timing in self._timings.items()
+            }
+            values = {
+                name: {**value, "mean": value["sum"] / value["count"]}
+                for name, value in self._values.items()
+            }
+            gauges = dict(self._gauges)
+
+        gauge_values = {}
+        for name, callback in gauges.items():
+            try:
+                gauge_values[name] = callback()
+            except Exception as e:
+                logger.warning(f"Gauge '{name}' failed: {e}")
+                gauge_values[name] = None
+
+        return {
+            "counters": counters,
+            "timings": timings,
+            "values": values,
+            "gauges": gauge_values,
+        }
+
+
+# Singleton instance for global access
+metrics = MetricsRegistry()
+
+
+async def monitor_event_loop_lag(interval_seconds: float = 0.1):
+    """Record how late the event loop wakes up from a periodic sleep.
+    
+    Any synchronous work on the loop thread (or a thread holding the GIL)
+    delays the wake-up; the delay is recorded as `event_loop.lag_seconds`.
+    Runs until cancelled.
+    
+    Args:
+        interval_seconds: Sleep between two probes
+    """
+    loop = asyncio.get_running_loop()
+    while True:
+        started_at = loop.time()
+        await asyncio.sleep(interval_seconds)
+        lag = loop.time() - started_at - interval_seconds
+        metrics.observe("event_loop.lag_seconds", max(lag, 0.0))
@@ -0,0 +1,48 @@
+# Internal module imports
+from .batch import preprocess_query_texts
+from .lemmatizer import (
+    get_normal_form,
+    lemma_cache,
+    seed_lemma_cache,
+    seed_lemma_cache_from_csv,
+)
+from .normalizer import (
+    GLOSSARY,
+    GLOSSARY_EXPANDER,
+    STOP_NORMAL_FORMS,
+    GlossaryExpander,
+    anonymize_text,
+    expand_glossary,
+    normalize_text,
+    normalize_whitespace,
+    tokenize_text,
+)
+from .pipeline import clean_query_text, is_stop_word, preprocess_query_text
+from .signatures import compute_simhash, estimate_token_count, hamming_distance
+from .stop_words import STOP_SURFACE_FORMS, build_stop_word_index
+
+
+__all__ = [
+    'GLOSSARY',
+    'GLOSSARY_EXPANDER',
+    'STOP_NORMAL_FORMS',
+    'STOP_SURFACE_FORMS',
+    'GlossaryExpander',
+    'anonymize_text',
+    'build_stop_word_index',
+    'clean_query_text',
+    'compute_simhash',
+    'estimate_token_count',
+    'expand_glossary',
+    'get_normal_form',
+    'hamming_distance',
+    'is_stop_word',
+    'lemma_cache',
+    'normalize_text',
+    'normalize_whitespace',
+    'preprocess_query_text',
+    'preprocess_query_texts',
+    'seed_lemma_cache',
+    'seed_lemma_cache_from_csv',
+    'tokenize_text',
+]
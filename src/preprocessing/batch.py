@@ -0,0 +1,83 @@
+# Standard library imports
+import logging
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from itertools import islice
+from typing import Iterable, Iterator
+
+# Internal module imports
+from .normalizer import GLOSSARY_EXPANDER, GlossaryExpander
+from .pipeline import clean_query_text
+
+
+# Configure module-level logging
+logger = logging.getLogger(__name__)
+
+
+def _preprocess_chunk(texts: list[str], glossary_expander: GlossaryExpander) -> list[str]:
+    """Preprocess a chunk of texts inside a worker process."""
+    return [clean_query_text(text, glossary_expander) for text in texts]
+
+
+def _chunked(texts: Iterable[str], chunksize: int) -> Iterator[list[str]]:
+    iterator = iter(texts)
+    while chunk := list(islice(iterator, chunksize)):
+        yield chunk
+
+
+def preprocess_query_texts(
+    texts: Iterable[str],
+    workers: int | None = None,
+    chunksize: int = 64,
+    glossary_expander: GlossaryExpander = GLOSSARY_EXPANDER,
+) -> Iterator[str]:
+    """Preprocess many texts in parallel, streaming results in input order.
+    
+    Texts are sharded into chunks and processed by a pool of worker
+    processes. Workers use the stop-word index of the parent process, which
+    they inherit on fork or rebuild on import under spawn. Only a bounded
+    number of chunks is in flight, so arbitrarily long iterables can be
+    streamed.
+    
+    Args:
+        texts: Raw texts to preprocess
+        workers: Number of worker processes (defaults to CPU count);
+            1 processes texts in the current process
+        chunksize: Number of texts sent to a worker at once
+        glossary_expander: Expander of the glossary to apply
+        
+    Yields:
+        Cleaned texts, in the same order as the input
+    """
+    workers = workers or os.cpu_count() or 1
+    preprocess_chunk = partial(_preprocess_chunk, glossary_expander=glossary_expander)
+    
+    if workers == 1:
+        for chunk in _chunked(texts, chunksize):
+            yield from preprocess_chunk(chunk)
+        return
+
+    logger.info(f"Preprocessing texts with {workers} worker processes "
+                f"(chunk size {chunksize})")
+    
+    max_chunks_in_flight = workers * 2
+    processed_count = 0
+    
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = deque()
+        for chunk in _chunked(texts, chunksize):
+            pending.append(executor.submit(preprocess_chunk, chunk))
+            
+            if len(pending) >= max_chunks_in_flight:
+                results = pending.popleft().result()
+                processed_count += len(results)
+                yield from results
+        
+        while pending:
+            results = pending.popleft().result()
+            processed_count += len(results)
+            yield from results
+
+    logger.info(f"Preprocessed {processed_count} texts")
@@ -0,0 +1,87 @@
+# Standard library imports
+import csv
+import logging
+from typing import Iterable
+
+# External library imports
+import pymorphy3
+
+# Internal module imports
+from src.caching import LRUCache
+from .normalizer import normalize_text, tokenize_text
+
+
+# Configure module-level logging
+logger = logging.getLogger(__name__)
+
+# Default bound on the number of cached token -> lemma entries
+DEFAULT_LEMMA_CACHE_SIZE = 50_000
+
+# Initialize morphological analyzer
+morphological_analyzer = pymorphy3.MorphAnalyzer()
+
+# Shared lemma cache in front of the analyzer
+lemma_cache = LRUCache(maxsize=DEFAULT_LEMMA_CACHE_SIZE)
+
+
+def get_normal_form(token: str) -> str:
+    """Return the most probable normal form of the token, using the cache.
+    
+    Args:
+        token: Lowercase token
+        
+    Returns:
+        Normal form (lemma) of the token
+    """
+    normal_form = lemma_cache.get(token)
+    if normal_form is None:
+        normal_form = morphological_analyzer.parse(token)[0].normal_form
+        lemma_cache.set(token, normal_form)
+    return normal_form
+
+
+def seed_lemma_cache(texts: Iterable[str]) -> int:
+    """Pre-populate the lemma cache with the vocabulary of the given texts.
+    
+    Only words missing from the pymorphy3 dictionary are seeded: dictionary
+    words are filtered by the surface-form index and never looked up.
+    
+    Args:
+        texts: Raw texts whose tokens should be lemmatized ahead of time
+        
+    Returns:
+        Number of distinct tokens seeded
+    """
+    vocabulary = set()
+    for text in texts:
+        vocabulary.update(
+            token for token in tokenize_text(normalize_text(text))
+            if not morphological_analyzer.word_is_known(token)
+        )
+
+    for token in vocabulary:
+        lemma_cache.set(token, morphological_analyzer.parse(token)[0].normal_form)
+
+    logger.info(f"Seeded lemma cache with {len(vocabulary)} tokens "
+                f"(cache size {len(lemma_cache)}/{lemma_cache.maxsize})")
+    return len(vocabulary)
+
+
+def seed_lemma_cache_from_csv(csv_file_path: str, columns: Iterable[str]) -> int:
+    """Pre-populate the lemma cache with the vocabulary of CSV columns.
+    
+    Args:
+        csv_file_path: Path to the CSV file
+        columns: Names of the text columns to take the vocabulary from
+        
+    Returns:
+        Number of distinct tokens seeded
+    """
+    columns = list(columns)
+    logger.info(f"Seeding lemma cache from columns {columns} of {csv_file_path}")
+
+    with open(csv_file_path, newline='', encoding='utf-8') as csvfile:
+        csv_reader = csv.DictReader(csvfile)
+        return seed_lemma_cache(
+            row[column] for row in csv_reader for column in columns
+        )
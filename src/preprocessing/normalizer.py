@@ -0,0 +1,240 @@
+# Standard library imports
+import logging
+import re
+
+
+# Configure module-level logging
+logger = logging.getLogger(__name__)
+
+
+# Words removed from queries, grouped by their normal form
+GREETING_WORDS = frozenset({
+    'здравствуйте', "здравствуй", 'привет', "приветствую", 'добрый',
+    'день', 'утро', 'вечер', "ночь", "дд"
+})
+
+POLITE_WORDS = frozenset({
+    'пожалуйста', 'пож', 'будь', 'добрый', 'спасибо', 'благодарю',
+    'прошу', "спс", "плиз", "плз"
+})
+
+SELF_INTRO_WORDS = frozenset({
+    'я', 'меня', 'зовут', 'будучи', 'являюсь'
+})
+
+QUEST_WORDS = frozenset({
+    "как", "где", "какой"
+})
+
+REQUEST_VERBS = frozenset({
+    'хотеть', 'просить', 'помогать', 'надо', 'нужно', 'требовать',
+    'просьба', 'возможность', "необходимо", "подсказать"
+})
+
+ROLES = frozenset({
+    "bp", 'менеджер', 'руководитель', 'работник',
+    'начальник', 'администратор', "должность"
+})
+
+PROFANITY = frozenset({
+    'блять', "бля", "сука", "пиздец", "хуй", "нахуй", "хрен", "нахрен",
+    "хуйня", "пизда", "ебать", "ебанина", "заебал", "заебало"
+})
+
+STOP_NORMAL_FORMS = (
+    GREETING_WORDS | POLITE_WORDS | SELF_INTRO_WORDS | QUEST_WORDS
+    | REQUEST_VERBS | ROLES | PROFANITY
+)
+
+
+# Glossary for abbreviation expansion
+GLOSSARY = {
+    'лк': 'личный кабинет',
+    'бир': 'беременность и роды',
+    'зп': 'заработная плата',
+    'ндфл': 'налог на доходы физических лиц',
+    'стд': 'срочный трудовой договор',
+    'тк': 'трудовой договор',
+    'ао': 'авансовый отчет',
+    'sla': 'сроки',
+    'эцп': 'электронная цифровая подпись',
+    'кр': 'кадровый резерв',
+    "сфр": "социальный фонд россии",
+    "мчд": "машиночитаемая доверенность",
+    "дк": "директор кластера",
+    "тел": "телефон",
+    "адм": "административный кадровый резерв",
+    "мс": "мастер-система",
+    "орг": "организационная структура",
+    "дмп": "директор магазина по продажам",
+    "комп": "компьютер",
+    "атз": "администратор торгового зала",
+    "дм": "директор магазина",
+    "мп": "мобильное приложение",
+    "уз": "учетная запись",
+    "чаэс": "чернобыльская атомная электростанция",
+    "мкс": "местность, приравненная к районам крайнего севера",
+    "ркс": "район крайнего севера",
+    "нрд": "ненормированный рабочий день",
+    "доп": "дополнительный",
+    "гос": "государственный",
+    "lk": "личный кабинет",
+    "бл": "больничный лист",
+    "ду": "дежурный управляющий",
+    "лтз": "администратор торгового зала",
+    "тех": "технический",
+    "сот": "система оценок труда",
+    "асуз": "автоматизированная система учёта и записи",
+    "скилаз": "система для автоматизации найма и развития талантов",
+    "skillz": "система для автоматизации найма и развития талантов",
+    "скиллаз": "система для автоматизации найма и развития талантов",
+    "skillaz": "система для автоматизации найма и развития талантов",
+    "здм": "заместитель директора магазина",
+    "эп": "электронная подпись",
+    "пк": "персональный консультант",
+    "пб": "платежная база",
+    "сф": "система финансов",
+    "трв": "табель рабочего времени",
+    "есп": "единая система приемки",
+    "рц": "распределительный центр",
+    "бс": "больничный лист",
+    "скд": "система корпоративных документов",
+    "sap": "корпоративная система для управления ресурсами и бизнес-процессами",
+    "сб": "социальная безопасность",
+    "атп": "автотранспортное предприятие",
+    "ур": "удаленная работа",
+    "дс": "дополнительное соглашение",
+    "уд": "удаленный",
+    "укэп": "усиленная квалифицированная электронная подпись",
+    "унэп": "усиленная неквалифицированна электронная подпись",
+    "фл": "физическое лицо",
+    "юл": "юридическое лицо",
+    "sed": "система электронного документооборота",
+    "мед": "медицинский",
+    "дмс": "добровольное медицинское страхование"
+}
+
+
+# Anonymization patterns and their replacements, applied one after
+# another in this order (a later pattern may match text left by an
+# earlier one, so the order is part of the output)
+ANONYMIZATION_RULES = (
+    (re.compile(r'[a-zA-Z0-9_.+-]+@[a-zA-Z0-9-]+\.[a-zA-Z0-9-.]+'), 'MAIL'),
+    (re.compile(r'(?:https?://[^\s]+|www\.[^\s]+)'), 'LINK'),
+    (re.compile(r'\+7 \(xxx\) xxx xx xx'), 'PHONE'),
+    (re.compile(r'табельный номер \d+'), ''),
+    (re.compile(r'тн \d+'), ''),
+    (re.compile(r'№ \d+'), ''),
+)
+
+
+class GlossaryExpander:
+    """Expands the abbreviations of a glossary in a single regex scan.
+    
+    The alternation has one group per abbreviation, so a match maps back
+    to its glossary entry without re-normalizing the matched text.
+    """
+
+    def __init__(self, glossary: dict[str, str]):
+        """Compile the glossary.
+        
+        Args:
+            glossary: Mapping of lowercase abbreviations to full forms
+        """
+        self.glossary = glossary
+        self._abbreviations = tuple(glossary)
+        self._regex = re.compile(
+            r'\b(?:' + '|'.join(
+                f'({re.escape(abbreviation)})' for abbreviation in self._abbreviations
+            ) + r')\b',
+            flags=re.IGNORECASE,
+        )
+
+    def _replace_match(self, match: re.Match) -> str:
+        return self.glossary[self._abbreviations[match.lastindex - 1]]
+
+    def expand(self, text: str) -> str:
+        """Expand known abbreviations to their full forms.
+        
+        Args:
+            text: Input text
+            
+        Returns:
+            Text with glossary abbreviations expanded
+        """
+        return self._regex.sub(self._replace_match, text)
+
+
+# Precompiled expander of the shared glossary
+GLOSSARY_EXPANDER = GlossaryExpander(GLOSSARY)
+
+TOKEN_SEPARATOR_REGEX = re.compile(r'[.,!?;:()\[\]{}/-]')
+
+
+def normalize_whitespace(text: str) -> str:
+    """Remove excessive whitespace and normalize spacing in text.
+    
+    Args:
+        text: Input text to normalize
+        
+    Returns:
+        Text with normalized whitespace
+    """
+    return ' '.join(text.split())
+
+
+def anonymize_text(text: str) -> str:
+    """Mask e-mails, links and phones and drop personnel/document numbers.
+    
+    Args:
+        text: Lowercased input text
+        
+    Returns:
+        Text with sensitive fragments replaced
+    """
+    for pattern, replacement in ANONYMIZATION_RULES:
+        text = pattern.sub(replacement, text)
+    return text
+
+
+def expand_glossary(text: str) -> str:
+    """Expand abbreviations of the shared glossary in a single scan.
+    
+    Args:
+        text: Input text
+        
+    Returns:
+        Text with glossary abbreviations expanded
+    """
+    return GLOSSARY_EXPANDER.expand(text)
+
+
+def normalize_text(text: str, glossary_expander: GlossaryExpander = GLOSSARY_EXPANDER) -> str:
+    """Lowercase, anonymize and expand abbreviations in the text.
+    
+    Args:
+        text: Raw input text
+        glossary_expander: Expander of the glossary to apply
+        
+    Returns:
+        Normalized text ready for tokenization
+    """
+    text = text.lower().strip()
+    text = anonymize_text(text)
+    text = normalize_whitespace(text)
+    return glossary_expander.expand(text)
+
+
+def tokenize_text(text: str) -> list[str]:
+    """Split normalized text into lowercase tokens on punctuation and spaces.
+    
+    Args:
+        text: Normalized text
+        
+    Returns:
+        List of tokens
+    """
+    tokens = []
+    for sentence in TOKEN_SEPARATOR_REGEX.split(text.lower()):
+        tokens.extend(sentence.split())
+    return tokens
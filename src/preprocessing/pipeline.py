@@ -0,0 +1,78 @@
+# Standard library imports
+import logging
+
+# Internal module imports
+from .lemmatizer import get_normal_form, morphological_analyzer
+from .normalizer import (
+    GLOSSARY_EXPANDER,
+    STOP_NORMAL_FORMS,
+    GlossaryExpander,
+    normalize_text,
+    tokenize_text,
+)
+from .stop_words import STOP_SURFACE_FORMS
+
+
+# Configure module-level logging
+logger = logging.getLogger(__name__)
+
+
+def is_stop_word(token: str) -> bool:
+    """Check whether the token is a form of a stop word.
+    
+    Dictionary words are decided by the surface-form index alone. Words
+    pymorphy3 doesn't know (typos, slang) are not in the index, so their
+    guessed normal form is looked up through the lemma cache instead.
+    
+    Args:
+        token: Lowercase token
+        
+    Returns:
+        True if the token should be removed from the query
+    """
+    if token in STOP_SURFACE_FORMS:
+        return True
+    if morphological_analyzer.word_is_known(token):
+        return False
+    return get_normal_form(token) in STOP_NORMAL_FORMS
+
+
+def clean_query_text(text: str, glossary_expander: GlossaryExpander = GLOSSARY_EXPANDER) -> str:
+    """Run the preprocessing pipeline on the text without logging.
+    
+    Args:
+        text: Raw input text to preprocess
+        glossary_expander: Expander of the glossary to apply
+        
+    Returns:
+        Cleaned and processed text ready for retrieval
+    """
+    tokens = tokenize_text(normalize_text(text, glossary_expander))
+    return ' '.join(token for token in tokens if not is_stop_word(token))
+
+
+def preprocess_query_text(text: str) -> str:
+    """Preprocess and clean query text for better matching.
+    
+    This function performs comprehensive text preprocessing including:
+    - Greeting and polite words removal
+    - Email, link, and phone number anonymization
+    - Glossary expansion for abbreviations
+    - Profanity and role-specific terms filtering by their inflected
+      surface forms (see `stop_words.STOP_SURFACE_FORMS`), with
+      morphological analysis only for unknown words (see `is_stop_word`)
+    
+    Args:
+        text: Raw input text to preprocess
+        
+    Returns:
+        Cleaned and processed text ready for retrieval
+    """
+    logger.info(f"Starting text preprocessing for query: {text[:50]}...")
+    
+    processed_text = clean_query_text(text)
+    
+    logger.info(f"Text preprocessing completed. Original length: {len(text)}, "
+                f"Processed length: {len(processed_text)}")
+    
+    return processed_text
@@ -0,0 +1,84 @@
+# Standard library imports
+import hashlib
+import logging
+import math
+import re
+
+# Internal module imports
+from .normalizer import GREETING_WORDS, POLITE_WORDS, anonymize_text
+
+
+# Configure module-level logging
+logger = logging.getLogger(__name__)
+
+
+SIGNATURE_BITS = 64
+SHINGLE_SIZE = 3
+
+# Courtesy words and masking placeholders do not change what an answer says
+SIGNATURE_IGNORED_WORDS = GREETING_WORDS | POLITE_WORDS | frozenset({
+    'link', 'mail', 'phone'
+})
+
+SIGNATURE_WORD_REGEX = re.compile(r'\w+')
+
+# Rough characters-per-token ratio of BPE tokenizers on Russian text
+CHARS_PER_TOKEN = 3.0
+
+
+def _signature_words(text: str) -> list[str]:
+    """Lowercase the text, mask links and contacts, and drop punctuation and courtesy words."""
+    return [
+        word for word in SIGNATURE_WORD_REGEX.findall(anonymize_text(text.lower()))
+        if word not in SIGNATURE_IGNORED_WORDS
+    ]
+
+
+def _shingle_hash(shingle: str) -> int:
+    return int.from_bytes(hashlib.blake2b(shingle.encode('utf-8'), digest_size=8).digest(), 'big')
+
+
+def compute_simhash(text: str, shingle_size: int = SHINGLE_SIZE) -> str:
+    """Compute the SimHash signature of a text over word shingles.
+    
+    Texts that differ only in punctuation, greetings or masked links get
+    identical or close signatures (small Hamming distance).
+    
+    Args:
+        text: Input text
+        shingle_size: Number of consecutive words per shingle
+        
+    Returns:
+        64-bit signature as a 16-character hex string
+    """
+    words = _signature_words(text)
+    shingles = [
+        ' '.join(words[start:start + shingle_size])
+        for start in range(max(len(words) - shingle_size + 1, 1))
+    ]
+    
+    bit_weights = [0] * SIGNATURE_BITS
+    for shingle in shingles:
+        shingle_hash = _shingle_hash(shingle)
+        for bit in range(SIGNATURE_BITS):
+            bit_weights[bit] += 1 if shingle_hash >> bit & 1 else -1
+    
+    signature = sum(1 << bit for bit, weight in enumerate(bit_weights) if weight > 0)
+    return f'{signature:016x}'
+
+
+def hamming_distance(first_signature: str, second_signature: str) -> int:
+    """Return the number of differing bits between two hex signatures."""
+    return (int(first_signature, 16) ^ int(second_signature, 16)).bit_count()
+
+
+def estimate_token_count(text: str) -> int:
+    """Estimate the number of LLM tokens in a text without a tokenizer.
+    
+    Args:
+        text: Input text
+        
+    Returns:
+        Approximate token count
+    """
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
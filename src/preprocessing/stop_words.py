@@ -0,0 +1,51 @@
+# Standard library imports
+import logging
+from typing import Iterable
+
+# Internal module imports
+from .lemmatizer import morphological_analyzer
+from .normalizer import STOP_NORMAL_FORMS
+
+
+# Configure module-level logging
+logger = logging.getLogger(__name__)
+
+
+def build_stop_word_index(normal_forms: Iterable[str]) -> frozenset[str]:
+    """Build the set of inflected surface forms whose lemma is a stop word.
+    
+    Candidates are all word forms of every lexeme the stop words can belong
+    to. A candidate is kept only if its most probable normal form is itself
+    a stop word, so the index removes exactly the tokens lemma-based
+    filtering would remove for dictionary words. Unknown words are left to
+    `pipeline.is_stop_word`.
+    
+    Args:
+        normal_forms: Normal forms of the words to filter out
+        
+    Returns:
+        Frozen set of lowercase surface forms
+    """
+    normal_forms = frozenset(normal_forms)
+
+    candidates = set(normal_forms)
+    for word in normal_forms:
+        for parse in morphological_analyzer.parse(word):
+            candidates.update(form.word for form in parse.lexeme)
+
+    # Texts are often typed without "ё"
+    candidates.update([form.replace('ё', 'е') for form in candidates])
+
+    # Candidates are looked up once, so they bypass the lemma cache
+    surface_forms = frozenset(
+        form for form in candidates
+        if morphological_analyzer.parse(form)[0].normal_form in normal_forms
+    )
+
+    logger.info(f"Built stop-word index with {len(surface_forms)} surface forms "
+                f"for {len(normal_forms)} normal forms")
+    return surface_forms
+
+
+# Precompiled surface-form index for query filtering
+STOP_SURFACE_FORMS = build_stop_word_index(STOP_NORMAL_FORMS)
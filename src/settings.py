@@ -1,5 +1,6 @@
 # Standard library imports
 import logging
+from typing import Literal
 
 # External library imports
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -33,6 +34,12 @@ class LLMSettings(BaseSettings):
     API_BASE_URL: str
     MODEL_NAME: str
     API_KEY: str
+    TIMEOUT: float = 60.0
+    MAX_RETRIES: int = 2
+    MAX_CONNECTIONS: int = 50
+    MAX_KEEPALIVE_CONNECTIONS: int = 20
+    KEEPALIVE_EXPIRY: float = 30.0
+    METRICS_URL: str | None = None
     
     model_config = SettingsConfigDict(
         env_prefix="LLM_", 
@@ -46,6 +53,15 @@ class EmbedderSettings(BaseSettings):
     
     API_BASE_URL: str
     MODEL_NAME: str
+    TIMEOUT: float = 30.0
+    MAX_CONNECTIONS: int = 20
+    MAX_KEEPALIVE_CONNECTIONS: int = 10
+    KEEPALIVE_EXPIRY: float = 30.0
+    BATCH_SIZE: int = 64
+    INGEST_CONCURRENCY: int = 4
+    CACHE_DIR: str = "./data/embedding_cache"
+    QUERY_CACHE_SIZE: int = 10_000
+    QUERY_CACHE_TTL_SECONDS: float = 3600.0
     
     model_config = SettingsConfigDict(
         env_prefix="EMBEDDER_",
@@ -72,8 +88,24 @@ class QdrantSettings(BaseSettings):
     """Qdrant vector database configuration settings."""
     
     URL: str
+    PREFER_GRPC: bool = False
+    GRPC_PORT: int = 6334
+    TIMEOUT: int = 30
     QA_COLLECTION_NAME: str
     TOP_N: int
+    GROUP_BY_ANSWER: bool = True
+    GROUP_OVERSAMPLING: float = 5.0
+    UPSERT_BATCH_SIZE: int = 256
+    FORCE_REBUILD: bool = False
+    INIT_RETRY_SECONDS: float = 30.0
+    SEARCH_BACKEND: Literal["qdrant", "numpy"] = "qdrant"
+    INDEX_PRECISION: Literal["float32", "float16", "int8"] = "float32"
+    QUANTIZATION: Literal["none", "int8"] = "none"
+    QUANTIZATION_QUANTILE: float = 0.99
+    QUANTIZATION_ALWAYS_RAM: bool = True
+    VECTORS_ON_DISK: bool = False
+    RESCORE_OVERSAMPLING: float = 2.0
+    QUANTIZATION_REPORT_SAMPLES: int = 100
     
     model_config = SettingsConfigDict(
         env_prefix="QDRANT_",
@@ -82,6 +114,59 @@ class QdrantSettings(BaseSettings):
     )
 
 
+class PreprocessingSettings(BaseSettings):
+    """Query preprocessing configuration settings."""
+    
+    LEMMA_CACHE_SIZE: int = 50_000
+    SEED_LEMMA_CACHE: bool = False
+    EXECUTOR: Literal["inline", "thread", "process"] = "thread"
+    POOL_SIZE: int = 4
+    
+    model_config = SettingsConfigDict(
+        env_prefix="PREPROCESSING_",
+        env_file="./env/.env",
+        extra='ignore'
+    )
+
+
+class SanityCheckSettings(BaseSettings):
+    """LLM relevance check configuration settings."""
+    
+    ACCEPT_SCORE: float = 1.01
+    REJECT_SCORE: float = -1.0
+    CACHE_SIZE: int = 50_000
+    CACHE_TTL_SECONDS: float = 86400.0
+    BATCH_TOKEN_BUDGET: int = 2048
+    MAX_BATCH_SIZE: int = 10
+    
+    model_config = SettingsConfigDict(
+        env_prefix="SANITY_CHECK_",
+        env_file="./env/.env",
+        extra='ignore'
+    )
+
+
+class WorkflowSettings(BaseSettings):
+    """Assistant workflow behaviour settings."""
+    
+    EXACT_MATCH_POLICY: Literal["off", "unique", "first"] = "off"
+    HISTORY_RETRIEVAL: Literal["fusion", "concat"] = "fusion"
+    HISTORY_QUERIES: int = 2
+    HISTORY_WEIGHT_DECAY: float = 0.5
+    RRF_K: int = 60
+    SCORE_FLOOR: float = 0.3
+    SCORE_MAX_GAP: float = 0.2
+    COLLAPSE_NEAR_DUPLICATES: bool = True
+    NEAR_DUPLICATE_MAX_DISTANCE: int = 10
+    SPECULATIVE_REPLY: bool = False
+    
+    model_config = SettingsConfigDict(
+        env_prefix="WORKFLOW_",
+        env_file="./env/.env",
+        extra='ignore'
+    )
+
+
 class Settings(BaseSettings):
     """Main application settings container."""
     
@@ -90,6 +175,9 @@ class Settings(BaseSettings):
     embedder: EmbedderSettings = EmbedderSettings()
     langfuse: LangfuseSettings = LangfuseSettings()
     qdrant: QdrantSettings = QdrantSettings()
+    preprocessing: PreprocessingSettings = PreprocessingSettings()
+    sanity_check: SanityCheckSettings = SanityCheckSettings()
+    workflow: WorkflowSettings = WorkflowSettings()
 
 
 # Singleton instance of Settings
@@ -56,6 +56,13 @@ async def bot(history: List[Dict[str, str]], clear_history: List[Dict[str, str]]
             ]
             logger.info("Chatbot response received and history updated")
             return history, clear_history
+        elif response.status_code == 503:
+            logger.warning("API is not ready yet, search index is still loading")
+            history.append({
+                "role": "assistant",
+                "content": "Сервис запускается и загружает базу знаний. Пожалуйста, повторите запрос через минуту."
+            })
+            return history, clear_history
         else:
             error_msg = f"API Error: {response.status_code} - {response.text}"
             logger.error(error_msg)
@@ -0,0 +1,64 @@
+# Standard library imports
+import random
+import re
+import unittest
+
+# Internal module imports
+from src.preprocessing import GLOSSARY, normalize_text
+
+
+def baseline_normalize_text(text: str) -> str:
+    """Normalization as `preprocess_query_text` did it with one pass per pattern."""
+    text = text.lower().strip()
+    text = re.sub(r'[a-zA-Z0-9_.+-]+@[a-zA-Z0-9-]+\.[a-zA-Z0-9-.]+', 'MAIL', text)
+    text = re.sub(r'(https?://[^\s]+|www\.[^\s]+)', 'LINK', text)
+    text = re.sub(r'\+7 \(xxx\) xxx xx xx', 'PHONE', text)
+    text = re.sub(r'табельный номер \d+', '', text)
+    text = re.sub(r'тн \d+', '', text)
+    text = re.sub(r'№ \d+', '', text)
+    text = ' '.join(text.split())
+    for abbreviation, full_form in GLOSSARY.items():
+        pattern = r'\b' + re.escape(abbreviation) + r'\b'
+        text = re.sub(pattern, full_form, text, flags=re.IGNORECASE)
+    return text
+
+
+# Fragments the fuzzed texts are built from: parts of every pattern and
+# their neighbours
+FRAGMENTS = [
+    'тн', 'тн№', '№', 'табельный', 'номер', 'табельный номер', '1', '23', '5номер',
+    'user.name@mail.ru', 'a@b.c', '@', 'x5.ru', 'https://x5.ru/a', 'www.x5', 'http://',
+    '+7 (xxx) xxx xx xx', '+7', '(xxx)', 'xxx xx xx', 'зарплата', 'отпуск',
+    *GLOSSARY, 'ЗП', 'Лк', 'SAP',
+]
+SEPARATORS = ['', ' ', '  ', ',', '.', '-', '\n']
+
+
+class NormalizeTextParityTest(unittest.TestCase):
+    """`normalize_text` must match the former sequential substitutions byte-for-byte."""
+
+    def assert_matches_baseline(self, text: str):
+        self.assertEqual(normalize_text(text), baseline_normalize_text(text), repr(text))
+
+    def test_known_cases(self):
+        for text in [
+            'тн№ 23 1 зп',
+            'табельный тн 5номер 7 зарплата',
+            'тнтабельный номер 5 7',
+            'мой тн 123, почта user@x5.ru, сайт www.x5.ru',
+            'Позвоните +7 (xxx) xxx xx xx, ДК и лк',
+        ]:
+            self.assert_matches_baseline(text)
+
+    def test_fuzzed_texts(self):
+        rng = random.Random(0)
+        for _ in range(5_000):
+            text = ''.join(
+                rng.choice(FRAGMENTS) + rng.choice(SEPARATORS)
+                for _ in range(rng.randint(1, 8))
+            )
+            self.assert_matches_baseline(text)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,58 @@
+# Standard library imports
+import random
+import unittest
+
+# Internal module imports
+from src.preprocessing import STOP_NORMAL_FORMS, clean_query_text, is_stop_word
+from src.preprocessing.lemmatizer import morphological_analyzer
+
+
+def baseline_is_stop_word(token: str) -> bool:
+    """Stop-word test as `preprocess_query_text` did it by lemmatizing every token."""
+    return morphological_analyzer.parse(token)[0].normal_form in STOP_NORMAL_FORMS
+
+
+LETTERS = 'абвгдеёжзийклмнопрстуфхцчшщъыьэюя'
+
+
+def make_typo(word: str, rng: random.Random) -> str:
+    """Delete, insert or replace one letter of the word."""
+    position = rng.randrange(len(word))
+    edit = rng.randrange(3)
+    if edit == 0 and len(word) > 1:
+        return word[:position] + word[position + 1:]
+    if edit == 1:
+        return word[:position] + rng.choice(LETTERS) + word[position:]
+    return word[:position] + rng.choice(LETTERS) + word[position + 1:]
+
+
+class StopWordFilterTest(unittest.TestCase):
+    """Filtering by the surface-form index must remove what lemma filtering removed."""
+
+    def test_unknown_words_are_filtered(self):
+        for token in ['пиздца', 'должностю', 'возможностю', 'добрыи', 'хотетьа']:
+            self.assertTrue(is_stop_word(token), token)
+
+    def test_query_keeps_content_words(self):
+        self.assertEqual(
+            clean_query_text('Здравствуйте, подскажите пожалуйста как оформить отпуск'),
+            'оформить отпуск',
+        )
+
+    def test_inflections_and_typos_match_baseline(self):
+        forms = sorted({
+            form.word
+            for word in STOP_NORMAL_FORMS
+            for parse in morphological_analyzer.parse(word)
+            for form in parse.lexeme
+        })
+        rng = random.Random(0)
+        for _ in range(5_000):
+            token = rng.choice(forms)
+            if rng.random() < 0.8:
+                token = make_typo(token, rng)
+            self.assertEqual(is_stop_word(token), baseline_is_stop_word(token), token)
+
+
+if __name__ == '__main__':
+    unittest.main()